@@ -4,11 +4,17 @@ AI驱动的项目管理系统 - 使用示例
 展示如何使用Claude API进行自动化开发和评审
 """
 
+import os
+import logging
+
 from project_manager import ProjectManager
 from project_manager.auto_workflow import AutoWorkflow
 from project_manager.ai_integration import AIIntegration
 from project_manager.config_loader import get_config_loader
 
+logging.basicConfig(level=os.environ.get("LOGLEVEL", "INFO"), format="%(message)s")
+logger = logging.getLogger("project_manager")
+
 
 def example_1_basic_usage():
     """示例1: 基本使用流程"""
@@ -188,9 +194,8 @@ def main():
         print("=" * 60)
 
     except Exception as e:
-        print(f"\n❌ 示例运行失败: {e}")
-        import traceback
-        traceback.print_exc()
+        # logger.exception自动附带堆栈,替代手动traceback.print_exc
+        logger.exception("❌ 示例运行失败: %s", e)
 
 
 if __name__ == "__main__":
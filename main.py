@@ -5,12 +5,25 @@ AI驱动的项目开发流程管理系统
 """
 
 import sys
+import os
+import json
+import logging
 import argparse
+import contextlib
 from pathlib import Path
 from typing import Optional
 
 from project_manager import ProjectManager, Phase, Mode
-from project_manager.auto_workflow import AutoWorkflow
+
+# 结构化日志: 错误路径走logging惰性格式化,LOGLEVEL=WARNING可整体静音INFO输出
+logging.basicConfig(level=os.environ.get("LOGLEVEL", "INFO"), format="%(message)s")
+logger = logging.getLogger("project_manager")
+
+try:
+    # 启用input()的行编辑和历史记录(POSIX环境自动生效)
+    import readline  # noqa: F401
+except ImportError:
+    pass
 
 
 def print_banner():
@@ -23,136 +36,207 @@ def print_banner():
     print("=" * 60)
 
 
+# 状态输出模板: 一次性格式化+单次write,避免交互循环中每次十余个print调用
+STATUS_TEMPLATE = """
+📊 项目状态：{project_name}
+📍 当前阶段：{current_phase}
+🔄 迭代次数：{phase_iteration}
+🎯 当前模式：{current_mode}
+📈 项目状态：{status}
+{score_line}🚫 阻塞问题：{blocked_issues_count}个
+💡 改进建议：{improvements_count}个
+📝 评审次数：{review_count}次
+{rollback_lines}🔄 回退次数：{rollback_count}次
+🔒 质量门禁：{quality_gates}
+"""
+
+
 def print_status(manager: ProjectManager):
     """打印项目状态"""
     status = manager.get_current_status()
-    print(f"\n📊 项目状态：{status['project_name']}")
-    print(f"📍 当前阶段：{status['current_phase']}")
-    print(f"🔄 迭代次数：{status['phase_iteration']}")
-    print(f"🎯 当前模式：{status['current_mode']}")
-    print(f"📈 项目状态：{status['status']}")
-    if status['latest_score']:
-        print(f"⭐ 最新评分：{status['latest_score']}分")
-    print(f"🚫 阻塞问题：{status['blocked_issues_count']}个")
-    print(f"💡 改进建议：{status['improvements_count']}个")
-    print(f"📝 评审次数：{status['review_count']}次")
+
+    score_line = f"⭐ 最新评分：{status['latest_score']}分\n" if status['latest_score'] else ""
+    rollback_lines = ""
     if status['from_rollback']:
-        print(f"⚠️  来自回退：是")
+        rollback_lines = "⚠️  来自回退：是\n"
         if status['rollback_reason']:
-            print(f"🔄 回退原因：{status['rollback_reason']}")
-    print(f"🔄 回退次数：{status['rollback_count']}次")
-    print(f"🔒 质量门禁：{status['quality_gates']}")
+            rollback_lines += f"🔄 回退原因：{status['rollback_reason']}\n"
+
+    sys.stdout.write(STATUS_TEMPLATE.format(
+        score_line=score_line,
+        rollback_lines=rollback_lines,
+        **status
+    ))
+
+
+def _action_set_developer(manager: ProjectManager, project_name: str):
+    """操作1: 切换到开发模式"""
+    manager.set_mode("developer")
+    print("✅ 已切换到开发模式")
+
+
+def _action_set_reviewer(manager: ProjectManager, project_name: str):
+    """操作2: 切换到评审模式"""
+    manager.set_mode("reviewer")
+    print("✅ 已切换到评审模式")
+
+
+def _action_execute_phase(manager: ProjectManager, project_name: str):
+    """操作3: 执行当前阶段任务"""
+    try:
+        # 流式输出: 生成内容边到达边打印,无需等待完整响应
+        result = manager.execute_phase(
+            on_delta=lambda text: print(text, end="", flush=True)
+        )
+        print(f"\n✅ 执行完成 ({len(result)}字符)")
+    except Exception as e:
+        logger.error("❌ 执行失败：%s", e)
+
+
+def _action_review_phase(manager: ProjectManager, project_name: str):
+    """操作4: 评审当前阶段成果"""
+    try:
+        result = manager.review_phase()
+        print(f"📊 评审结果：")
+        print(f"   总分：{result['score']}分")
+        print(f"   问题数：{len(result['issues'])}个")
+        print(f"   改进建议：{len(result['improvements'])}个")
+
+        if result['improvements']:
+            print(f"   最重要改进：{result['improvements'][0]}")
+    except Exception as e:
+        logger.error("❌ 评审失败：%s", e)
+
+
+def _action_check_transition(manager: ProjectManager, project_name: str):
+    """操作5: 检查阶段转换条件"""
+    if manager.check_phase_transition():
+        print("✅ 可以进入下一阶段")
+    else:
+        print("❌ 还不能进入下一阶段")
+
+
+def _action_force_next(manager: ProjectManager, project_name: str):
+    """操作6: 强制进入下一阶段"""
+    manager.force_next_phase()
+    print("⚠️  已强制进入下一阶段")
+
+
+def _action_next_iteration(manager: ProjectManager, project_name: str):
+    """操作7: 进入下一次迭代"""
+    manager.next_iteration()
+    print("✅ 已进入下一次迭代")
+
+
+def _action_export_report(manager: ProjectManager, project_name: str):
+    """操作8: 导出项目报告"""
+    report_file = manager.export_report()
+    print(f"📄 项目报告已导出：{report_file}")
+
+
+def _action_auto_workflow(manager: ProjectManager, project_name: str):
+    """操作9: 运行自动化工作流"""
+    try:
+        from project_manager.auto_workflow import AutoWorkflow
+        auto_workflow = AutoWorkflow(project_name)
+        result = auto_workflow.run_auto_workflow()
+        print(f"🤖 自动化工作流完成：{result['status']}")
+    except Exception as e:
+        logger.error("❌ 自动化工作流失败：%s", e)
+
+
+def _action_smart_workflow(manager: ProjectManager, project_name: str):
+    """操作10: 运行智能工作流"""
+    try:
+        target_score = float(input("请输入目标分数 (默认85.0): ") or "85.0")
+        from project_manager.auto_workflow import AutoWorkflow
+        auto_workflow = AutoWorkflow(project_name)
+        result = auto_workflow.run_smart_workflow(target_score)
+        print(f"🧠 智能工作流完成：{result['status']}")
+    except Exception as e:
+        logger.error("❌ 智能工作流失败：%s", e)
+
+
+def _action_continuous_improvement(manager: ProjectManager, project_name: str):
+    """操作11: 运行持续改进工作流"""
+    try:
+        max_phases = int(input("请输入最大阶段数 (默认5): ") or "5")
+        from project_manager.auto_workflow import AutoWorkflow
+        auto_workflow = AutoWorkflow(project_name)
+        result = auto_workflow.run_continuous_improvement(max_phases)
+        print(f"🚀 持续改进工作流完成：{result['status']}")
+    except Exception as e:
+        logger.error("❌ 持续改进工作流失败：%s", e)
+
+
+def _action_quit(manager: ProjectManager, project_name: str):
+    """操作12: 退出"""
+    print("👋 再见！")
+    return True
+
+
+# 交互菜单分发表: 序号即下标(0号占位),选择解析为int后一次索引完成分发
+ACTIONS = [
+    None,
+    _action_set_developer,
+    _action_set_reviewer,
+    _action_execute_phase,
+    _action_review_phase,
+    _action_check_transition,
+    _action_force_next,
+    _action_next_iteration,
+    _action_export_report,
+    _action_auto_workflow,
+    _action_smart_workflow,
+    _action_continuous_improvement,
+    _action_quit,
+]
+
+MENU_TEXT = """
+🔧 可用操作：
+1. 切换到开发模式
+2. 切换到评审模式
+3. 执行当前阶段任务
+4. 评审当前阶段成果
+5. 检查阶段转换条件
+6. 强制进入下一阶段
+7. 进入下一次迭代
+8. 导出项目报告
+9. 运行自动化工作流
+10. 运行智能工作流
+11. 运行持续改进工作流
+12. 退出
+"""
 
 
 def interactive_mode(project_name: str):
     """交互式模式"""
     print_banner()
-    
+
     try:
         manager = ProjectManager(project_name)
         print(f"✅ 项目 '{project_name}' 初始化成功")
-        
+
         while True:
             print_status(manager)
-            
-            print("\n🔧 可用操作：")
-            print("1. 切换到开发模式")
-            print("2. 切换到评审模式")
-            print("3. 执行当前阶段任务")
-            print("4. 评审当前阶段成果")
-            print("5. 检查阶段转换条件")
-            print("6. 强制进入下一阶段")
-            print("7. 进入下一次迭代")
-            print("8. 导出项目报告")
-            print("9. 运行自动化工作流")
-            print("10. 运行智能工作流")
-            print("11. 运行持续改进工作流")
-            print("12. 退出")
-            
+            sys.stdout.write(MENU_TEXT)
+
             choice = input("\n请选择操作 (1-12): ").strip()
-            
-            if choice == "1":
-                manager.set_mode("developer")
-                print("✅ 已切换到开发模式")
-                
-            elif choice == "2":
-                manager.set_mode("reviewer")
-                print("✅ 已切换到评审模式")
-                
-            elif choice == "3":
-                try:
-                    result = manager.execute_phase()
-                    print(f"✅ 执行结果：{result}")
-                except Exception as e:
-                    print(f"❌ 执行失败：{e}")
-                    
-            elif choice == "4":
-                try:
-                    result = manager.review_phase()
-                    print(f"📊 评审结果：")
-                    print(f"   总分：{result['score']}分")
-                    print(f"   问题数：{len(result['issues'])}个")
-                    print(f"   改进建议：{len(result['improvements'])}个")
-                    
-                    if result['improvements']:
-                        print(f"   最重要改进：{result['improvements'][0]}")
-                except Exception as e:
-                    print(f"❌ 评审失败：{e}")
-                    
-            elif choice == "5":
-                can_transition = manager.check_phase_transition()
-                if can_transition:
-                    print("✅ 可以进入下一阶段")
-                else:
-                    print("❌ 还不能进入下一阶段")
-                    
-            elif choice == "6":
-                manager.force_next_phase()
-                print("⚠️  已强制进入下一阶段")
-                
-            elif choice == "7":
-                manager.next_iteration()
-                print("✅ 已进入下一次迭代")
-                
-            elif choice == "8":
-                report_file = manager.export_report()
-                print(f"📄 项目报告已导出：{report_file}")
-                
-            elif choice == "9":
-                try:
-                    auto_workflow = AutoWorkflow(project_name)
-                    result = auto_workflow.run_auto_workflow()
-                    print(f"🤖 自动化工作流完成：{result['status']}")
-                except Exception as e:
-                    print(f"❌ 自动化工作流失败：{e}")
-                    
-            elif choice == "10":
-                try:
-                    target_score = float(input("请输入目标分数 (默认85.0): ") or "85.0")
-                    auto_workflow = AutoWorkflow(project_name)
-                    result = auto_workflow.run_smart_workflow(target_score)
-                    print(f"🧠 智能工作流完成：{result['status']}")
-                except Exception as e:
-                    print(f"❌ 智能工作流失败：{e}")
-                    
-            elif choice == "11":
-                try:
-                    max_phases = int(input("请输入最大阶段数 (默认5): ") or "5")
-                    auto_workflow = AutoWorkflow(project_name)
-                    result = auto_workflow.run_continuous_improvement(max_phases)
-                    print(f"🚀 持续改进工作流完成：{result['status']}")
-                except Exception as e:
-                    print(f"❌ 持续改进工作流失败：{e}")
-                    
-            elif choice == "12":
-                print("👋 再见！")
-                break
-                
-            else:
+
+            try:
+                index = int(choice)
+            except ValueError:
+                index = 0
+            if not 1 <= index < len(ACTIONS):
                 print("❌ 无效选择，请重新输入")
-                
+                continue
+
+            # 退出操作返回True,其余操作返回None继续循环
+            if ACTIONS[index](manager, project_name):
+                break
+
     except Exception as e:
-        print(f"❌ 初始化失败：{e}")
+        logger.exception("❌ 初始化失败：%s", e)
         sys.exit(1)
 
 
@@ -162,8 +246,9 @@ def init_project(project_name: str):
         manager = ProjectManager(project_name)
         print(f"✅ 项目 '{project_name}' 初始化成功")
         print_status(manager)
+        return manager.get_current_status()
     except Exception as e:
-        print(f"❌ 初始化失败：{e}")
+        logger.exception("❌ 初始化失败：%s", e)
         sys.exit(1)
 
 def define_requirements_mode(project_name: str, requirements: str):
@@ -186,10 +271,11 @@ def define_requirements_mode(project_name: str, requirements: str):
         print(f"📁 生成的配置文件：")
         for config_type, file_path in result['config_files'].items():
             print(f"   - {config_type}: {file_path}")
-        
+
         print_status(manager)
+        return result
     except Exception as e:
-        print(f"❌ 要件定义失败：{e}")
+        logger.exception("❌ 要件定义失败：%s", e)
         sys.exit(1)
 
 def get_requirements_mode(project_name: str):
@@ -210,9 +296,10 @@ def get_requirements_mode(project_name: str):
             print(f"🗄️  数据库：{requirements['tech_stack']['database']}")
         print(f"🚀 部署平台：{requirements['deployment']['platform']}")
         print(f"📊 项目类型：{requirements['project_type']}")
-        
+
+        return requirements
     except Exception as e:
-        print(f"❌ 获取要件失败：{e}")
+        logger.exception("❌ 获取要件失败：%s", e)
         sys.exit(1)
 
 def dev_mode(project_name: str, phase: str):
@@ -228,8 +315,9 @@ def dev_mode(project_name: str, phase: str):
         result = manager.execute_phase()
         print(f"✅ 开发执行结果：{result}")
         print_status(manager)
+        return {"result": result, "status": manager.get_current_status()}
     except Exception as e:
-        print(f"❌ 开发模式失败：{e}")
+        logger.exception("❌ 开发模式失败：%s", e)
         sys.exit(1)
 
 def review_mode(project_name: str, phase: str):
@@ -250,10 +338,11 @@ def review_mode(project_name: str, phase: str):
         
         if result['improvements']:
             print(f"   最重要改进：{result['improvements'][0]}")
-        
+
         print_status(manager)
+        return result
     except Exception as e:
-        print(f"❌ 评审模式失败：{e}")
+        logger.exception("❌ 评审模式失败：%s", e)
         sys.exit(1)
 
 def status_mode(project_name: str):
@@ -261,8 +350,9 @@ def status_mode(project_name: str):
     try:
         manager = ProjectManager(project_name)
         print_status(manager)
+        return manager.get_current_status()
     except Exception as e:
-        print(f"❌ 状态查看失败：{e}")
+        logger.exception("❌ 状态查看失败：%s", e)
         sys.exit(1)
 
 def report_mode(project_name: str):
@@ -271,12 +361,14 @@ def report_mode(project_name: str):
         manager = ProjectManager(project_name)
         report_file = manager.export_report()
         print(f"📄 项目报告已导出：{report_file}")
+        return {"report_file": str(report_file)}
     except Exception as e:
-        print(f"❌ 报告生成失败：{e}")
+        logger.exception("❌ 报告生成失败：%s", e)
         sys.exit(1)
 
 def auto_workflow_mode(project_name: str):
     """自动化工作流模式"""
+    from project_manager.auto_workflow import AutoWorkflow
     try:
         auto_workflow = AutoWorkflow(project_name)
         result = auto_workflow.run_auto_workflow()
@@ -285,12 +377,14 @@ def auto_workflow_mode(project_name: str):
         print(f"🔄 总迭代次数：{result['total_iterations']}")
         if result['final_score']:
             print(f"⭐ 最终评分：{result['final_score']}分")
+        return result
     except Exception as e:
-        print(f"❌ 自动化工作流失败：{e}")
+        logger.exception("❌ 自动化工作流失败：%s", e)
         sys.exit(1)
 
 def smart_workflow_mode(project_name: str, target_score: float):
     """智能工作流模式"""
+    from project_manager.auto_workflow import AutoWorkflow
     try:
         auto_workflow = AutoWorkflow(project_name)
         result = auto_workflow.run_smart_workflow(target_score)
@@ -299,12 +393,14 @@ def smart_workflow_mode(project_name: str, target_score: float):
         print(f"🔄 总迭代次数：{result['total_iterations']}")
         if result['final_score']:
             print(f"⭐ 最终评分：{result['final_score']}分")
+        return result
     except Exception as e:
-        print(f"❌ 智能工作流失败：{e}")
+        logger.exception("❌ 智能工作流失败：%s", e)
         sys.exit(1)
 
 def continuous_improvement_mode(project_name: str, max_phases: int):
     """持续改进工作流模式"""
+    from project_manager.auto_workflow import AutoWorkflow
     try:
         auto_workflow = AutoWorkflow(project_name)
         result = auto_workflow.run_continuous_improvement(max_phases)
@@ -313,18 +409,56 @@ def continuous_improvement_mode(project_name: str, max_phases: int):
         print(f"🔄 总迭代次数：{result['total_iterations']}")
         if result['final_score']:
             print(f"⭐ 最终评分：{result['final_score']}分")
+        return result
     except Exception as e:
-        print(f"❌ 持续改进工作流失败：{e}")
+        logger.exception("❌ 持续改进工作流失败：%s", e)
         sys.exit(1)
 
 
+def demo_batch_mode(project_name: str = "demo_project"):
+    """批量演示模式 - 通过Message Batches API一次提交全部阶段生成请求"""
+    from project_manager.batch_runner import BatchRunner
+    from project_manager.ai_integration import AIIntegration
+
+    print_banner()
+    print("🎬 开始批量演示模式...")
+
+    try:
+        manager = ProjectManager(project_name)
+        ai = AIIntegration(project_name=project_name)
+        runner = BatchRunner()
+
+        # 将所有阶段的生成请求打包成一个批量任务
+        items = []
+        for phase in [Phase.BASIC_DESIGN, Phase.DETAIL_DESIGN, Phase.DEVELOPMENT]:
+            template = ai.get_development_prompt(phase)
+            # custom_id仅允许[a-zA-Z0-9_-],阶段值本身即满足且批内唯一
+            items.append(runner.build_request(
+                custom_id=phase.value,
+                prompt=template,
+                system_prompt=f"你是一个专业的软件开发专家,正在为项目的{phase.value}阶段生成高质量的内容。"
+            ))
+
+        results = runner.submit_phases(items)
+
+        # 保存各阶段输出
+        for custom_id, content in results.items():
+            manager._save_phase_output(content, Phase(custom_id), 0)
+            print(f"   ✅ {custom_id}: {len(content)} 字符")
+
+        print("\n🎉 批量演示完成！")
+
+    except Exception as e:
+        logger.exception("❌ 批量演示失败：%s", e)
+
+
 def demo_mode():
     """演示模式"""
     print_banner()
     print("🎬 开始演示模式...")
-    
+
     project_name = "demo_project"
-    
+
     try:
         manager = ProjectManager(project_name)
         print(f"✅ 创建演示项目：{project_name}")
@@ -391,7 +525,42 @@ def demo_mode():
         print("\n🎉 演示完成！")
         
     except Exception as e:
-        print(f"❌ 演示失败：{e}")
+        logger.exception("❌ 演示失败：%s", e)
+
+
+def demo_command(args):
+    """演示命令入口"""
+    if args.batch:
+        demo_batch_mode()
+    else:
+        demo_mode()
+
+
+def define_command(args):
+    """要件定义命令入口"""
+    if not args.requirements:
+        print("❌ 错误：要件定义需要指定 --requirements")
+        sys.exit(1)
+    define_requirements_mode(args.project, args.requirements)
+
+
+# 命令分发表: O(1)查找替代main()中的长if/elif链,新增命令只需注册一行
+COMMANDS = {
+    "init": lambda args: init_project(args.project),
+    "dev": lambda args: dev_mode(args.project, args.phase),
+    "review": lambda args: review_mode(args.project, args.phase),
+    "status": lambda args: status_mode(args.project),
+    "report": lambda args: report_mode(args.project),
+    "auto": lambda args: auto_workflow_mode(args.project),
+    "smart": lambda args: smart_workflow_mode(args.project, args.score),
+    "improve": lambda args: continuous_improvement_mode(args.project, args.phases),
+    "demo": demo_command,
+    "define": define_command,
+    "requirements": lambda args: get_requirements_mode(args.project),
+}
+
+# 不需要--project参数的命令
+PROJECT_OPTIONAL_COMMANDS = {"demo"}
 
 
 def main():
@@ -451,57 +620,41 @@ def main():
         "--requirements", "-r",
         help="项目要件描述（自然语言）"
     )
+
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="以JSON格式输出结果(人类可读输出转到stderr,便于脚本/CI解析)"
+    )
+
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="演示模式使用Message Batches API批量提交（非交互,成本约为实时调用的50%%）"
+    )
     
     args = parser.parse_args()
-    
-    # 处理演示模式
-    if args.command == "demo":
-        demo_mode()
-        return
-    
-    # 处理初始化命令
-    if args.command == "init":
-        if not args.project:
-            print("❌ 错误：初始化项目需要指定 --project")
-            parser.print_help()
-            sys.exit(1)
-        init_project(args.project)
-        return
-    
-    # 其他命令需要项目名称
-    if not args.project:
-        print("❌ 错误：需要指定 --project")
+
+    handler = COMMANDS.get(args.command)
+    if handler is None:
+        print("❌ 错误：无效的命令")
         parser.print_help()
         sys.exit(1)
-    
-    # 处理其他命令
-    if args.command == "dev":
-        dev_mode(args.project, args.phase)
-    elif args.command == "review":
-        review_mode(args.project, args.phase)
-    elif args.command == "status":
-        status_mode(args.project)
-    elif args.command == "report":
-        report_mode(args.project)
-    elif args.command == "auto":
-        auto_workflow_mode(args.project)
-    elif args.command == "smart":
-        smart_workflow_mode(args.project, args.score)
-    elif args.command == "improve":
-        continuous_improvement_mode(args.project, args.phases)
-    elif args.command == "define":
-        if not args.requirements:
-            print("❌ 错误：要件定义需要指定 --requirements")
-            parser.print_help()
-            sys.exit(1)
-        define_requirements_mode(args.project, args.requirements)
-    elif args.command == "requirements":
-        get_requirements_mode(args.project)
-    else:
-        print("❌ 错误：无效的命令")
+
+    # 除演示模式外,所有命令都需要项目名称
+    if args.command not in PROJECT_OPTIONAL_COMMANDS and not args.project:
+        print("❌ 错误：需要指定 --project")
         parser.print_help()
         sys.exit(1)
 
+    if args.json:
+        # 机器可读模式: 人类可读输出重定向到stderr,stdout只输出一个JSON对象
+        with contextlib.redirect_stdout(sys.stderr):
+            result = handler(args)
+        sys.stdout.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+    else:
+        handler(args)
+
 
 if __name__ == "__main__":
     main()
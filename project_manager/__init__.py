@@ -6,8 +6,29 @@ AI驱动的项目开发流程管理系统
 __version__ = "1.0.0"
 __author__ = "AI Project Manager"
 
-from .project_manager import ProjectManager
-from .review_engine import ReviewEngine
-from .models import ProjectState, Phase, Mode
-
 __all__ = ["ProjectManager", "ReviewEngine", "ProjectState", "Phase", "Mode"]
+
+# PEP 562延迟导入: 按属性名映射到所在子模块,首次访问时才真正import,
+# 使status/report等轻量命令的冷启动不必加载评审引擎及其依赖
+_LAZY_ATTRS = {
+    "ProjectManager": ".project_manager",
+    "ReviewEngine": ".review_engine",
+    "ProjectState": ".models",
+    "Phase": ".models",
+    "Mode": ".models",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        from importlib import import_module
+        module = import_module(_LAZY_ATTRS[name], __name__)
+        value = getattr(module, name)
+        # 写回模块命名空间,后续访问不再走__getattr__
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
@@ -2,17 +2,205 @@
 AI集成模块
 负责将Claude AI与项目管理模板集成,提供自动化的AI生成和评审功能
 """
+import asyncio
+import functools
 import json
 import os
-from typing import Dict, List, Optional, Any
+import re
+from typing import Callable, Dict, List, Optional, Any
 from pathlib import Path
 from datetime import datetime
 
+try:
+    # 可选依赖: orjson解析多KB评审回复快2-5倍;缺失时回退stdlib json
+    import orjson
+    _json_loads = orjson.loads
+
+    def _dumps_context(obj: Any) -> str:
+        """序列化项目上下文为带缩进的JSON字符串(orjson的C实现)"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    _json_loads = json.loads
+
+    def _dumps_context(obj: Any) -> str:
+        """序列化项目上下文为带缩进的JSON字符串(stdlib回退)"""
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+
+try:
+    # 可选依赖: config.yaml解析需要PyYAML;优先C实现的SafeLoader(快5-10倍)
+    import yaml
+    try:
+        from yaml import CSafeLoader as _YamlLoader
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader
+except ImportError:
+    yaml = None
+    _YamlLoader = None
+
 from .models import Phase, Mode, ProjectState
 from .claude_provider import ClaudeProvider
 from .config_loader import get_config_loader
 from .prompt_manager import PromptManager
 from .issue_storage import IssueStorage
+from .parse_cache import cached_parse
+from .response_cache import SQLiteCache
+
+
+# 提示词缓存的最小块长度(字符数,近似对应Anthropic的1024 token缓存下限)
+_MIN_CACHEABLE_CHARS = 1024
+
+# 批量评审回复的行格式: "N. score=85 issues=[LEVEL:描述; ...] summary=总评"
+_BATCH_REVIEW_LINE_RE = re.compile(
+    r'^(\d+)\.\s*score=(\d+)\s*issues=\[(.*?)\]\s*summary=(.*)$',
+    re.M
+)
+
+# markdown代码围栏中的JSON体: 一次扫描同时覆盖```json和裸```两种围栏
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(.*?)```', re.S)
+
+# 产出质量信号: 单次扫描同时捕获结构/文档/错误处理/测试/依赖五类信号
+_QUALITY_RE = re.compile(
+    r'(?P<structure>^(?:def |class ))'
+    r'|(?P<doc>"""|\'\'\'|^#{1,3} )'
+    r'|(?P<error_handling>\btry:|\bexcept\b)'
+    r'|(?P<testing>\btest\b|\bassert\b)'
+    r'|(?P<imports>^(?:import |from ))',
+    re.M | re.I
+)
+
+# YAML配置解析缓存: (路径, mtime) → 解析结果,文件未变时零I/O零解析
+_CONFIG_CACHE: Dict[Any, Dict[str, Any]] = {}
+
+# ProjectManager类的模块级缓存: 循环依赖迫使延迟导入,但只做一次
+_ProjectManager = None
+
+
+def _get_pm_cls():
+    """获取ProjectManager类(延迟导入一次后缓存,避免循环导入)"""
+    global _ProjectManager
+    if _ProjectManager is None:
+        from .project_manager import ProjectManager
+        _ProjectManager = ProjectManager
+    return _ProjectManager
+
+
+def _load_yaml_config(path: Path) -> Dict[str, Any]:
+    """
+    加载并缓存YAML配置文件(按mtime失效)
+
+    Args:
+        path: 配置文件路径
+
+    Returns:
+        解析后的配置字典,文件不存在或yaml不可用时返回空字典
+    """
+    if yaml is None or not path.exists():
+        return {}
+
+    key = (str(path), path.stat().st_mtime_ns)
+    cached = _CONFIG_CACHE.get(key)
+    if cached is None:
+        # 进程内未命中时走磁盘缓存: 跨CLI进程复用已解析的配置
+        cached = cached_parse(
+            path, lambda text: yaml.load(text, Loader=_YamlLoader) or {}
+        )
+        # 同一路径的旧mtime条目随即失效,避免缓存无限增长
+        for stale in [k for k in _CONFIG_CACHE if k[0] == str(path) and k != key]:
+            del _CONFIG_CACHE[stale]
+        _CONFIG_CACHE[key] = cached
+    return cached
+
+
+@functools.lru_cache(maxsize=1)
+def _get_default_provider() -> ClaudeProvider:
+    """
+    获取进程级共享的默认Claude Provider实例
+
+    避免每次构造AIIntegration都重建Provider(及其底层连接),
+    交互模式中反复创建ProjectManager时可复用同一实例。
+
+    Returns:
+        共享的ClaudeProvider实例
+    """
+    config_loader = get_config_loader()
+    claude_config = config_loader.get_claude_config()
+    return ClaudeProvider(**claude_config)
+
+
+def _cacheable_block(text: str) -> Dict[str, Any]:
+    """
+    构建系统提示词block,足够长的稳定内容添加cache_control缓存断点
+
+    Args:
+        text: 提示词文本
+
+    Returns:
+        结构化的system block字典
+    """
+    block = {"type": "text", "text": text}
+    if len(text) >= _MIN_CACHEABLE_CHARS:
+        block["cache_control"] = {"type": "ephemeral"}
+    return block
+
+
+# ---- 提示词常量 ----
+# 静态提示词文本在模块加载时构建一次,避免每次调用重新拼接同样的常量内容
+
+# JSON schema示例固定不变,独立成块: 组装系统提示词时只格式化短头部,
+# 不再让.format每次重新解析整段多行模板
+_REVIEW_SCHEMA_BLOCK = """评审结果必须严格按照以下JSON格式返回:
+{
+    "score": 85,
+    "issues": [
+        {
+            "level": "CRITICAL",
+            "category": "功能完整性",
+            "description": "问题描述",
+            "location": "具体位置",
+            "suggestion": "改进建议"
+        }
+    ],
+    "improvements": [
+        "改进建议1",
+        "改进建议2"
+    ],
+    "summary": "总体评价"
+}"""
+
+_SYS_PROMPT_REVIEW_HEAD = """你是一个严格的代码评审专家,正在对项目的{phase}阶段进行专业评审。
+请按照评审标准仔细检查内容,给出客观公正的评分和详细的问题报告。
+
+"""
+
+_USER_PROMPT_REVIEW_TMPL = """# 待评审内容
+```
+{content}
+```
+
+请严格按照评审标准进行评审,并以JSON格式返回评审结果。"""
+
+_USER_PROMPT_GEN_PLAIN = "请按照系统提示词中的生成任务生成内容。"
+
+_USER_PROMPT_GEN_TMPL = """# 项目上下文
+{context}
+
+""" + _USER_PROMPT_GEN_PLAIN
+
+_SYS_PROMPT_BATCH_REVIEW = """你是一个严格的代码评审专家,需要对多个编号条目逐一评审。
+对每个条目,严格按照以下单行格式回复,每条目一行,不要输出其他内容:
+N. score=<0-100整数> issues=[<级别>:<问题描述>; <级别>:<问题描述>] summary=<一句话总评>
+
+级别取值: CRITICAL / MAJOR / MINOR。条目没有问题时issues=[]。"""
+
+_SYS_PROMPT_ARRAY_REVIEW = """你是一个严格的代码评审专家,需要按顺序评审多个编号条目。
+必须返回一个JSON数组,第i个元素是条目i的评审结果,每个元素严格遵循以下格式:
+{
+    "score": 85,
+    "issues": [{"level": "CRITICAL", "category": "分类", "description": "问题描述", "location": "位置", "suggestion": "建议"}],
+    "improvements": ["改进建议"],
+    "summary": "总体评价"
+}
+只返回JSON数组,不要输出其他内容。"""
 
 
 class AIIntegration:
@@ -30,20 +218,36 @@ class AIIntegration:
         self.prompt_manager = PromptManager("project_manager/prompts")
         self.config_file = Path("config.yaml")
 
-        # 初始化AI Provider
+        # 初始化AI Provider (默认复用进程级共享实例)
         if ai_provider:
             self.ai_provider = ai_provider
         else:
-            config_loader = get_config_loader()
-            claude_config = config_loader.get_claude_config()
-            self.ai_provider = ClaudeProvider(**claude_config)
-        
+            self.ai_provider = _get_default_provider()
+
+        # 评审结果缓存(延迟创建,首次评审时才建库)
+        self._response_cache: Optional[SQLiteCache] = None
+
+        # 各阶段生成系统提示词block的预组装缓存(阶段模板在进程内不变)
+        self._generation_blocks: Dict[str, List[Dict[str, Any]]] = {}
+
+        # ProjectManager实例及项目上下文缓存(按状态文件mtime失效)
+        self._project_manager = None
+        self._ctx_cache: Optional[Dict[str, Any]] = None
+        self._ctx_cache_mtime: Optional[int] = None
+
+    def _get_response_cache(self) -> SQLiteCache:
+        """获取评审结果缓存实例(延迟初始化)"""
+        if self._response_cache is None:
+            self._response_cache = SQLiteCache()
+        return self._response_cache
+
     def generate_content(
         self,
         phase: Phase,
         context: Optional[Dict[str, Any]] = None,
         max_tokens: int = 4096,
-        temperature: float = 1.0
+        temperature: float = 1.0,
+        on_delta: Optional[Callable[[str], None]] = None
     ) -> str:
         """
         使用AI生成指定阶段的内容
@@ -53,41 +257,167 @@ class AIIntegration:
             context: 项目上下文信息
             max_tokens: 最大生成token数
             temperature: 温度参数
+            on_delta: 流式输出回调,传入时使用SSE流式生成并逐段回调文本增量
 
         Returns:
             生成的内容
         """
-        # 获取生成模板
-        generation_template = self.prompt_manager.get_generation_template(phase.value)
-
-        # 构建系统提示词
-        system_prompt = f"""你是一个专业的软件开发专家,正在为项目的{phase.value}阶段生成高质量的内容。
-请严格按照提供的模板和要求生成内容,确保内容完整、专业、符合规范。"""
+        # 系统提示词block按阶段预组装缓存,迭代循环中不再重复拼接/构建
+        system_blocks = self._get_generation_system_blocks(phase)
 
-        # 构建用户提示词
-        user_prompt = generation_template
-
-        # 如果有上下文信息,添加到提示词中
+        # 变化的上下文信息放在用户提示词中(不加缓存断点)
         if context:
-            context_str = json.dumps(context, ensure_ascii=False, indent=2)
-            user_prompt = f"""# 项目上下文
-{context_str}
-
-# 生成任务
-{generation_template}"""
+            context_str = _dumps_context(context)
+            user_prompt = _USER_PROMPT_GEN_TMPL.format(context=context_str)
+        else:
+            user_prompt = _USER_PROMPT_GEN_PLAIN
 
-        # 调用AI生成
+        # 调用AI生成 (提供on_delta回调时走流式,边生成边回调)
         try:
+            if on_delta is not None:
+                chunks = []
+                for delta in self.ai_provider.generate_stream(
+                    prompt=user_prompt,
+                    system_prompt=system_blocks,
+                    max_tokens=max_tokens,
+                    temperature=temperature
+                ):
+                    on_delta(delta)
+                    chunks.append(delta)
+                return "".join(chunks)
+
             response = self.ai_provider.generate(
                 prompt=user_prompt,
-                system_prompt=system_prompt,
+                system_prompt=system_blocks,
                 max_tokens=max_tokens,
                 temperature=temperature
             )
+            self._log_cache_usage(response.usage)
             return response.content
         except Exception as e:
             raise RuntimeError(f"AI生成失败: {str(e)}")
 
+    def generate_content_stream(
+        self,
+        phase: Phase,
+        context: Optional[Dict[str, Any]] = None,
+        max_tokens: int = 4096,
+        temperature: float = 1.0
+    ):
+        """
+        流式生成指定阶段的内容 (生成器形式)
+
+        与generate_content的on_delta回调形式互补: 调用方以for循环
+        消费文本增量,首个token到达即可开始处理,无需等待完整响应。
+
+        Args:
+            phase: 项目阶段
+            context: 项目上下文信息
+            max_tokens: 最大生成token数
+            temperature: 温度参数
+
+        Yields:
+            生成的文本增量
+        """
+        system_blocks = self._get_generation_system_blocks(phase)
+
+        if context:
+            context_str = _dumps_context(context)
+            user_prompt = _USER_PROMPT_GEN_TMPL.format(context=context_str)
+        else:
+            user_prompt = _USER_PROMPT_GEN_PLAIN
+
+        try:
+            yield from self.ai_provider.generate_stream(
+                prompt=user_prompt,
+                system_prompt=system_blocks,
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+        except Exception as e:
+            raise RuntimeError(f"AI流式生成失败: {str(e)}")
+
+    def _get_generation_system_blocks(self, phase: Phase) -> List[Dict[str, Any]]:
+        """
+        获取指定阶段的生成系统提示词block(按阶段组装一次后复用)
+
+        固定的指令文本和阶段模板每次调用都相同: 预组装除了省去重复的
+        字符串拼接,也保证cache_control断点字节级稳定,提示词缓存不漂移。
+
+        Args:
+            phase: 项目阶段
+
+        Returns:
+            结构化system block列表
+        """
+        blocks = self._generation_blocks.get(phase.value)
+        if blocks is None:
+            generation_template = self.prompt_manager.get_generation_template(phase.value)
+            system_instruction = f"""你是一个专业的软件开发专家,正在为项目的{phase.value}阶段生成高质量的内容。
+请严格按照提供的模板和要求生成内容,确保内容完整、专业、符合规范。"""
+            blocks = [
+                _cacheable_block(system_instruction),
+                _cacheable_block(f"# 生成任务\n{generation_template}")
+            ]
+            self._generation_blocks[phase.value] = blocks
+        return blocks
+
+    def regenerate_from_review(
+        self,
+        phase: Phase,
+        prev_content: str,
+        review_issues: List[Dict[str, Any]],
+        max_tokens: int = 4096,
+        temperature: float = 1.0
+    ) -> str:
+        """
+        根据评审问题重新生成内容 (智能工作流的迭代改进路径)
+
+        请求结构针对提示词缓存优化: 稳定的系统指令/阶段模板在system块,
+        上一轮内容作为用户消息中的缓存断点块 —— 迭代N+1可直接从缓存读取
+        迭代N的上下文,只有新的评审问题部分需要重新计费。
+
+        Args:
+            phase: 项目阶段
+            prev_content: 上一轮迭代生成的内容
+            review_issues: 评审发现的问题列表
+            max_tokens: 最大生成token数
+            temperature: 温度参数
+
+        Returns:
+            改进后的内容
+        """
+        generation_template = self.prompt_manager.get_generation_template(phase.value)
+
+        system_instruction = f"""你是一个专业的软件开发专家,正在根据评审意见改进项目的{phase.value}阶段内容。
+请在保留上一版本优点的基础上,针对评审问题逐条修复,输出完整的改进版本。"""
+
+        system_blocks = [
+            _cacheable_block(system_instruction),
+            _cacheable_block(f"# 生成任务\n{generation_template}")
+        ]
+
+        issues_str = json.dumps(review_issues, ensure_ascii=False, indent=2)
+
+        # 用户消息拆成结构化block: 上一轮内容加缓存断点,新的评审问题在其后
+        user_content = [
+            _cacheable_block(f"# 上一版本内容\n{prev_content}"),
+            {"type": "text", "text": f"# 评审发现的问题\n{issues_str}\n\n请输出修复上述问题后的完整内容。"}
+        ]
+
+        from .ai_provider import AIMessage
+        try:
+            response = self.ai_provider.chat(
+                messages=[AIMessage(role="user", content=user_content)],
+                system_prompt=system_blocks,
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+            self._log_cache_usage(response.usage)
+            return response.content
+        except Exception as e:
+            raise RuntimeError(f"AI改进生成失败: {str(e)}")
+
     def review_content(
         self,
         phase: Phase,
@@ -107,12 +437,379 @@ class AIIntegration:
         Returns:
             评审结果字典,包含score, issues, improvements等
         """
+        # 内容寻址缓存: 智能工作流中相邻迭代产出相同内容时,直接复用上次评审结果
+        cache = self._get_response_cache()
+        cache_key = SQLiteCache.make_key(phase.value, content)
+        cached_result = cache.get(cache_key)
+        if cached_result is not None:
+            print("📦 评审缓存命中,跳过AI调用")
+            return cached_result
+
         # 获取评审提示词
         review_prompt = self.prompt_manager.get_combined_prompt(phase.value, "reviewer")
 
-        # 构建系统提示词
-        system_prompt = f"""你是一个严格的代码评审专家,正在对项目的{phase.value}阶段进行专业评审。
-请按照评审标准仔细检查内容,给出客观公正的评分和详细的问题报告。
+        # 构建系统提示词 (只格式化短头部,静态schema块直接拼接)
+        system_prompt = _SYS_PROMPT_REVIEW_HEAD.format(phase=phase.value) + _REVIEW_SCHEMA_BLOCK
+
+        # 稳定的系统提示词和评审标准放入可缓存block,变化的待评审内容放在最后
+        system_blocks = [
+            _cacheable_block(system_prompt),
+            _cacheable_block(f"# 评审标准\n{review_prompt}")
+        ]
+
+        # 构建用户提示词
+        user_prompt = _USER_PROMPT_REVIEW_TMPL.format(content=content)
+
+        # 调用AI评审
+        try:
+            response = self.ai_provider.generate(
+                prompt=user_prompt,
+                system_prompt=system_blocks,
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+            self._log_cache_usage(response.usage)
+
+            # 解析评审结果并写入缓存;解析失败的占位结果不入缓存,
+            # 否则一次瞬态的格式错误会按内容哈希永久钉死为0分
+            review_result = self._parse_review_result(response.content)
+            if not review_result.get("parse_error"):
+                cache.put(cache_key, review_result)
+            return review_result
+        except Exception as e:
+            raise RuntimeError(f"AI评审失败: {str(e)}")
+
+    # 单次批量评审的最大条目数(过大会降低模型逐条推理质量)
+    MAX_REVIEW_BATCH_SIZE = 8
+
+    def review_batch(
+        self,
+        items: List[Any],
+        max_tokens: int = 4096,
+        temperature: float = 0.3
+    ) -> List[Dict[str, Any]]:
+        """
+        批量评审: 将多个(阶段, 内容)条目打包进一次LLM调用
+
+        系统提示词和回复语法在条目间摊销,相比逐条评审可大幅减少
+        每条目的固定token开销;回复按编号行格式解析。
+
+        Args:
+            items: (Phase, content)元组列表,最多MAX_REVIEW_BATCH_SIZE条
+            max_tokens: 最大生成token数
+            temperature: 温度参数
+
+        Returns:
+            与items等长的评审结果字典列表(score/issues/summary)
+        """
+        if not items:
+            return []
+        if len(items) > self.MAX_REVIEW_BATCH_SIZE:
+            raise ValueError(f"批量评审最多支持{self.MAX_REVIEW_BATCH_SIZE}个条目")
+
+        sections = []
+        for index, (phase, content) in enumerate(items, 1):
+            sections.append(f"--- 条目{index} ({phase.value}) ---\n{content}")
+        user_prompt = "请逐条评审以下条目:\n\n" + "\n\n".join(sections)
+
+        try:
+            response = self.ai_provider.generate(
+                prompt=user_prompt,
+                system_prompt=[_cacheable_block(_SYS_PROMPT_BATCH_REVIEW)],
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+            self._log_cache_usage(response.usage)
+        except Exception as e:
+            raise RuntimeError(f"AI批量评审失败: {str(e)}")
+
+        return self._parse_batch_review(response.content, len(items))
+
+    @staticmethod
+    def _parse_batch_review(response_content: str, count: int) -> List[Dict[str, Any]]:
+        """
+        解析批量评审的编号行回复
+
+        Args:
+            response_content: AI返回的原始内容
+            count: 期望的条目数
+
+        Returns:
+            按条目编号排列的评审结果列表,缺失条目给出格式错误占位结果
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * count
+        for match in _BATCH_REVIEW_LINE_RE.finditer(response_content):
+            index = int(match.group(1)) - 1
+            if not 0 <= index < count:
+                continue
+            issues = []
+            for item in match.group(3).split(';'):
+                item = item.strip()
+                if not item:
+                    continue
+                level, _, description = item.partition(':')
+                if description:
+                    issues.append({"level": level.strip(), "description": description.strip()})
+                else:
+                    issues.append({"level": "MINOR", "description": item})
+            results[index] = {
+                "score": int(match.group(2)),
+                "issues": issues,
+                "improvements": [],
+                "summary": match.group(4).strip()
+            }
+
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = {
+                    "score": 0,
+                    "issues": [{
+                        "level": "CRITICAL",
+                        "description": f"批量评审回复中缺少条目{index + 1}的结果"
+                    }],
+                    "improvements": [],
+                    "summary": "批量评审结果解析失败"
+                }
+        return results
+
+    def review_content_batch(
+        self,
+        items: List[Any],
+        max_tokens: int = 8192,
+        temperature: float = 0.3
+    ) -> List[Dict[str, Any]]:
+        """
+        批量评审 (JSON数组形式): 一次调用评审多个条目,保留完整评审结构
+
+        与review_batch的单行语法不同,本方法要求模型返回与单条评审相同
+        schema的JSON数组,适合需要完整issues/improvements结构的调用方;
+        网络往返和系统提示词开销在条目间摊销。
+
+        Args:
+            items: (Phase, content)元组列表
+            max_tokens: 最大生成token数(数组回复较长,默认放宽)
+            temperature: 温度参数
+
+        Returns:
+            与items等长的评审结果字典列表
+        """
+        if not items:
+            return []
+
+        sections = []
+        for index, (phase, content) in enumerate(items, 1):
+            sections.append(f"--- ITEM {index} ({phase.value}) ---\n{content}")
+        user_prompt = f"请依次评审以下{len(items)}个条目,返回JSON数组:\n\n" + "\n\n".join(sections)
+
+        try:
+            response = self.ai_provider.generate(
+                prompt=user_prompt,
+                system_prompt=[_cacheable_block(_SYS_PROMPT_ARRAY_REVIEW)],
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+            self._log_cache_usage(response.usage)
+        except Exception as e:
+            raise RuntimeError(f"AI批量评审失败: {str(e)}")
+
+        # 提取并解析JSON数组,逐条目补全缺省字段
+        match = _JSON_FENCE_RE.search(response.content)
+        raw = (match.group(1) if match else response.content).strip()
+        try:
+            parsed = _json_loads(raw)
+            if not isinstance(parsed, list):
+                raise ValueError("回复不是JSON数组")
+        except ValueError as e:
+            # 整体解析失败: 每个条目都返回与单条解析失败一致的占位结果
+            return [self._parse_review_result(f"解析失败: {e}") for _ in items]
+
+        results = []
+        for index in range(len(items)):
+            if index < len(parsed) and isinstance(parsed[index], dict):
+                result = parsed[index]
+                result.setdefault("score", 0)
+                result.setdefault("issues", [])
+                result.setdefault("improvements", [])
+                result.setdefault("summary", "无评价")
+                results.append(result)
+            else:
+                results.append({
+                    "score": 0,
+                    "issues": [{
+                        "level": "CRITICAL",
+                        "category": "评审格式错误",
+                        "description": f"批量评审回复中缺少条目{index + 1}的结果",
+                        "location": "整体",
+                        "suggestion": "请重新生成评审结果"
+                    }],
+                    "improvements": ["确保返回与条目数等长的JSON数组"],
+                    "summary": "批量评审结果解析失败"
+                })
+        return results
+
+    async def agenerate_content(
+        self,
+        phase: Phase,
+        context: Optional[Dict[str, Any]] = None,
+        max_tokens: int = 4096,
+        temperature: float = 1.0
+    ) -> str:
+        """
+        generate_content的异步版本
+
+        本仓库仅依赖标准库,Provider没有原生异步客户端,因此通过
+        asyncio.to_thread把同步调用放入线程池,使事件循环在等待
+        网络I/O期间可以调度其他任务。
+
+        Args:
+            phase: 项目阶段
+            context: 项目上下文信息
+            max_tokens: 最大生成token数
+            temperature: 温度参数
+
+        Returns:
+            生成的内容
+        """
+        return await asyncio.to_thread(
+            self.generate_content, phase, context, max_tokens, temperature
+        )
+
+    async def areview_content(
+        self,
+        phase: Phase,
+        content: str,
+        max_tokens: int = 4096,
+        temperature: float = 0.3
+    ) -> Dict[str, Any]:
+        """
+        review_content的异步版本(线程池包装,复用缓存与解析逻辑)
+
+        Args:
+            phase: 项目阶段
+            content: 待评审的内容
+            max_tokens: 最大生成token数
+            temperature: 温度参数
+
+        Returns:
+            评审结果字典
+        """
+        return await asyncio.to_thread(
+            self.review_content, phase, content, max_tokens, temperature
+        )
+
+    async def review_many(
+        self,
+        items: List[Any],
+        max_concurrency: int = 10
+    ) -> List[Any]:
+        """
+        并发评审多个条目,信号量限制在途请求数
+
+        与review_content_batch(单请求打包)互补: 本方法发出多个独立
+        请求并重叠其网络延迟,单条失败不影响其他条目(异常原样返回
+        在对应位置,由调用方判断)。
+
+        Args:
+            items: (Phase, content)元组列表
+            max_concurrency: 最大并发请求数
+
+        Returns:
+            与items等长的结果列表,元素为评审结果字典或Exception
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _review_one(phase: Phase, content: str):
+            async with semaphore:
+                return await self.areview_content(phase, content)
+
+        tasks = [_review_one(phase, content) for phase, content in items]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    # 多视角评审的子维度及聚合权重
+    REVIEW_ASPECTS = {
+        "安全性": 0.3,
+        "性能": 0.3,
+        "可维护性": 0.4
+    }
+
+    def review_content_parallel(
+        self,
+        phase: Phase,
+        content: str,
+        max_tokens: int = 4096,
+        temperature: float = 0.3
+    ) -> Dict[str, Any]:
+        """
+        多视角并行评审: 将单次评审拆分为安全性/性能/可维护性三个子评审并发执行
+
+        总token数与单次评审相当,但墙钟时间约等于最慢的单个子评审,
+        而不是三次评审之和。
+
+        Args:
+            phase: 项目阶段
+            content: 待评审的内容
+            max_tokens: 每个子评审的最大生成token数
+            temperature: 温度参数
+
+        Returns:
+            聚合后的评审结果字典(score为加权平均,issues/improvements为合并)
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        def _review_aspect(aspect: str) -> Dict[str, Any]:
+            return self._review_single_aspect(
+                phase, content, aspect,
+                max_tokens=max_tokens, temperature=temperature
+            )
+
+        aspects = list(self.REVIEW_ASPECTS)
+        with ThreadPoolExecutor(max_workers=len(aspects)) as executor:
+            results = list(executor.map(_review_aspect, aspects))
+
+        # 本地聚合: 加权平均分 + 合并问题和改进建议
+        total_score = 0.0
+        issues: List[Dict[str, Any]] = []
+        improvements: List[str] = []
+        summaries: List[str] = []
+        for aspect, result in zip(aspects, results):
+            weight = self.REVIEW_ASPECTS[aspect]
+            total_score += result.get("score", 0) * weight
+            for issue in result.get("issues", []):
+                issue.setdefault("category", aspect)
+                issues.append(issue)
+            improvements.extend(result.get("improvements", []))
+            summaries.append(f"[{aspect}] {result.get('summary', '无评价')}")
+
+        return {
+            "score": round(total_score, 2),
+            "issues": issues,
+            "improvements": improvements,
+            "summary": "\n".join(summaries)
+        }
+
+    def _review_single_aspect(
+        self,
+        phase: Phase,
+        content: str,
+        aspect: str,
+        max_tokens: int = 4096,
+        temperature: float = 0.3
+    ) -> Dict[str, Any]:
+        """
+        执行单一维度的子评审
+
+        Args:
+            phase: 项目阶段
+            content: 待评审的内容
+            aspect: 评审维度(安全性/性能/可维护性)
+            max_tokens: 最大生成token数
+            temperature: 温度参数
+
+        Returns:
+            该维度的评审结果字典
+        """
+        system_prompt = f"""你是一个严格的代码评审专家,正在从{aspect}角度对项目的{phase.value}阶段进行专项评审。
+只关注{aspect}相关的问题,给出该维度的评分和问题报告。
 
 评审结果必须严格按照以下JSON格式返回:
 {{
@@ -120,44 +817,46 @@ class AIIntegration:
     "issues": [
         {{
             "level": "CRITICAL",
-            "category": "功能完整性",
+            "category": "{aspect}",
             "description": "问题描述",
             "location": "具体位置",
             "suggestion": "改进建议"
         }}
     ],
     "improvements": [
-        "改进建议1",
-        "改进建议2"
+        "改进建议1"
     ],
-    "summary": "总体评价"
+    "summary": "该维度的总体评价"
 }}"""
 
-        # 构建用户提示词
-        user_prompt = f"""# 评审标准
-{review_prompt}
-
-# 待评审内容
+        user_prompt = f"""# 待评审内容
 ```
 {content}
 ```
 
-请严格按照评审标准进行评审,并以JSON格式返回评审结果。"""
+请从{aspect}角度评审,并以JSON格式返回评审结果。"""
 
-        # 调用AI评审
-        try:
-            response = self.ai_provider.generate(
-                prompt=user_prompt,
-                system_prompt=system_prompt,
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
+        response = self.ai_provider.generate(
+            prompt=user_prompt,
+            system_prompt=[_cacheable_block(system_prompt)],
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        self._log_cache_usage(response.usage)
+        return self._parse_review_result(response.content)
 
-            # 解析评审结果
-            review_result = self._parse_review_result(response.content)
-            return review_result
-        except Exception as e:
-            raise RuntimeError(f"AI评审失败: {str(e)}")
+    @staticmethod
+    def _log_cache_usage(usage: Dict[str, int]) -> None:
+        """
+        输出提示词缓存使用统计,便于验证缓存断点是否生效
+
+        Args:
+            usage: API返回的token使用量字典
+        """
+        cache_read = usage.get("cache_read_input_tokens", 0)
+        cache_creation = usage.get("cache_creation_input_tokens", 0)
+        if cache_read or cache_creation:
+            print(f"📦 提示词缓存: 读取={cache_read} tokens, 写入={cache_creation} tokens")
 
     def _parse_review_result(self, response_content: str) -> Dict[str, Any]:
         """
@@ -170,21 +869,12 @@ class AIIntegration:
             解析后的评审结果字典
         """
         try:
-            # 尝试提取JSON内容
-            content = response_content.strip()
-
-            # 如果包含markdown代码块,提取其中的JSON
-            if "```json" in content:
-                start = content.find("```json") + 7
-                end = content.find("```", start)
-                content = content[start:end].strip()
-            elif "```" in content:
-                start = content.find("```") + 3
-                end = content.find("```", start)
-                content = content[start:end].strip()
-
-            # 解析JSON
-            result = json.loads(content)
+            # 如果包含markdown代码围栏,单次正则扫描提取其中的JSON
+            match = _JSON_FENCE_RE.search(response_content)
+            content = (match.group(1) if match else response_content).strip()
+
+            # 解析JSON (优先orjson)
+            result = _json_loads(content)
 
             # 验证必需字段
             if "score" not in result:
@@ -197,9 +887,11 @@ class AIIntegration:
                 result["summary"] = "无评价"
 
             return result
-        except json.JSONDecodeError as e:
-            # 如果JSON解析失败,返回一个基本的结果
+        except ValueError as e:
+            # 如果JSON解析失败,返回一个基本的结果 (orjson/json的解析错误都是ValueError子类)
+            # parse_error标记供调用方识别占位结果(例如跳过缓存写入)
             return {
+                "parse_error": True,
                 "score": 0,
                 "issues": [{
                     "level": "CRITICAL",
@@ -212,9 +904,18 @@ class AIIntegration:
                 "summary": f"评审结果解析失败: {response_content[:200]}"
             }
 
+    def _get_project_manager(self):
+        """获取并复用ProjectManager实例(延迟导入避免循环依赖)"""
+        if self._project_manager is None:
+            self._project_manager = _get_pm_cls()(self.project_name)
+        return self._project_manager
+
     def get_current_context(self) -> Dict[str, Any]:
         """
-        获取当前项目上下文信息
+        获取当前项目上下文信息(按状态文件mtime缓存)
+
+        一次CLI调用中本方法会被多个环节重复调用;状态文件未变时
+        直接返回上次构建的上下文,避免重复读状态和组装字典。
 
         Returns:
             项目上下文字典
@@ -222,12 +923,25 @@ class AIIntegration:
         if not self.project_name:
             return {}
 
-        # 这里需要导入ProjectManager,为了避免循环导入,延迟导入
-        from .project_manager import ProjectManager
-        project_manager = ProjectManager(self.project_name)
+        project_manager = self._get_project_manager()
+
+        # 状态文件未修改时复用缓存的上下文
+        try:
+            state_mtime = project_manager.state_file.stat().st_mtime_ns
+        except OSError:
+            state_mtime = None
+        if self._ctx_cache is not None and self._ctx_cache_mtime == state_mtime:
+            return self._ctx_cache
+
+        # 状态文件被改写(通常是外层ProjectManager推进了迭代/阶段):
+        # 复用的内层实例持有的还是加载时的旧状态,重建后再读
+        if self._ctx_cache_mtime != state_mtime and self._ctx_cache is not None:
+            self._project_manager = None
+            project_manager = self._get_project_manager()
+
         status = project_manager.get_current_status()
 
-        return {
+        context = {
             "project_name": status['project_name'],
             "current_phase": status['current_phase'],
             "phase_iteration": status['phase_iteration'],
@@ -242,25 +956,25 @@ class AIIntegration:
             "rollback_count": status['rollback_count'],
             "quality_gates": status['quality_gates']
         }
-    
+        self._ctx_cache = context
+        self._ctx_cache_mtime = state_mtime
+        return context
+
     def get_phase_requirements(self, phase: Phase) -> Dict[str, Any]:
         """
         获取指定阶段的要求
-        
+
         Args:
             phase: 项目阶段
-            
+
         Returns:
             阶段要求字典
         """
-        # 读取配置文件
-        if self.config_file.exists():
-            import yaml
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
-                
+        # 读取配置文件(mtime缓存,重复调用零解析)
+        config = _load_yaml_config(self.config_file)
+        if config:
             phase_config = config.get('phases', {}).get(phase.value, {})
-            
+
             return {
                 "focus_goals": phase_config.get('focus_goals', []),
                 "required_outputs": phase_config.get('required_outputs', []),
@@ -268,35 +982,85 @@ class AIIntegration:
                 "pass_score": phase_config.get('pass_score', 80),
                 "max_iterations": phase_config.get('max_iterations', 5)
             }
-        
+
         return {}
-    
+
+    def validate_ai_output(self, phase: Phase, output: str) -> Dict[str, Any]:
+        """
+        校验AI生成内容的基本质量
+
+        对内容做一次正则扫描,统计结构/文档/错误处理/测试/依赖五类
+        质量信号,并对照阶段配置中的required_outputs检查必需产出是否
+        提及;扫描是单趟的,多KB产出也只遍历一次。
+
+        Args:
+            phase: 项目阶段
+            output: AI生成的内容
+
+        Returns:
+            校验结果字典,包含valid, quality_score, signals, missing_outputs
+        """
+        # 单趟扫描: 命名组名即信号类别,全部命中即停止可提前退出
+        signals = set()
+        for match in _QUALITY_RE.finditer(output):
+            signals.add(match.lastgroup)
+            if len(signals) == len(_QUALITY_RE.groupindex):
+                break
+
+        # 必需产出检查: 阶段配置中列出的产出物需在内容中被提及。
+        # 内容只小写一次;产出项较多时改用交替正则,单趟扫描即可全部判定
+        requirements = self.get_phase_requirements(phase)
+        required_outputs = requirements.get('required_outputs', [])
+        lowered = output.lower()
+        if len(required_outputs) > 8:
+            pattern = re.compile(
+                '|'.join(re.escape(required.lower()) for required in required_outputs)
+            )
+            found = {match.group(0) for match in pattern.finditer(lowered)}
+            missing_outputs = [
+                required for required in required_outputs
+                if required.lower() not in found
+            ]
+        else:
+            missing_outputs = [
+                required for required in required_outputs
+                if required.lower() not in lowered
+            ]
+
+        quality_score = min(100, 50 + 10 * len(signals))
+        return {
+            "valid": bool(output.strip()) and not missing_outputs,
+            "quality_score": quality_score,
+            "signals": sorted(signals),
+            "missing_outputs": missing_outputs
+        }
+
     def get_development_prompt(self, phase: Phase) -> str:
         """
         获取开发模式提示词
-        
+
         Args:
             phase: 项目阶段
-            
+
         Returns:
             提示词内容
         """
         return self.prompt_manager.get_generation_template(phase.value)
-    
+
     def get_review_prompt(self, phase: Phase) -> str:
         """
         获取评审模式提示词
-        
+
         Args:
             phase: 项目阶段
-            
+
         Returns:
             提示词内容
         """
         return self.prompt_manager.get_combined_prompt(phase.value, "reviewer")
-    
 
-    
+
+
     def get_provider_info(self) -> Dict[str, Any]:
         """
         获取AI Provider信息
@@ -2,19 +2,22 @@
 AI Provider抽象接口
 定义统一的AI模型调用接口,支持多种后端
 """
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List
 from dataclasses import dataclass
 
 
-@dataclass
+# slots=True: 每次API调用都会分配这两个类的实例,槽存储省去每实例
+# __dict__的内存并加速属性访问,高频调用下降低GC压力
+@dataclass(slots=True)
 class AIMessage:
     """AI消息数据类"""
     role: str  # "user" or "assistant"
     content: str
 
 
-@dataclass
+@dataclass(slots=True)
 class AIResponse:
     """AI响应数据类"""
     content: str
@@ -88,6 +91,86 @@ class AIProvider(ABC):
         """
         pass
 
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 1.0,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        流式生成AI响应,逐段产出文本增量
+
+        默认实现退化为一次性生成后整体产出;支持流式的Provider
+        (如ClaudeProvider的SSE实现)应覆盖此方法。
+
+        Args:
+            prompt: 用户提示词
+            system_prompt: 系统提示词
+            max_tokens: 最大生成token数
+            temperature: 温度参数(0-1)
+            **kwargs: 其他模型参数
+
+        Yields:
+            生成的文本增量
+        """
+        response = self.generate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            **kwargs
+        )
+        yield response.content
+
+    async def generate_async(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 1.0,
+        **kwargs
+    ) -> AIResponse:
+        """
+        异步生成AI响应
+
+        默认实现把同步的generate放到线程池执行,避免阻塞事件循环;
+        拥有原生异步客户端的Provider可以覆盖此方法。
+
+        Args:
+            prompt: 用户提示词
+            system_prompt: 系统提示词
+            max_tokens: 最大生成token数
+            temperature: 温度参数(0-1)
+            **kwargs: 其他模型参数
+
+        Returns:
+            AI响应对象
+        """
+        return await asyncio.to_thread(
+            self.generate,
+            prompt=prompt,
+            system_prompt=system_prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            **kwargs
+        )
+
+    def close(self) -> None:
+        """
+        释放Provider持有的网络资源
+
+        默认无操作;维护持久连接的Provider(如ClaudeProvider)应覆盖。
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
     def validate_config(self) -> bool:
         """
         验证配置是否有效
@@ -2,144 +2,239 @@
 自动化工作流模块
 实现AI自动推进项目进度，最小化手动干预
 """
-import time
-from typing import Dict, Any, Optional
+import hashlib
+import logging
+from collections import deque
+from typing import Callable, Dict, Any, Optional
 from datetime import datetime
 
-from .project_manager import ProjectManager
-from .models import Phase, Mode
+log = logging.getLogger("auto_workflow")
 
 
 class AutoWorkflow:
     """自动化工作流管理器"""
     
-    def __init__(self, project_name: str, auto_mode: bool = True):
+    def __init__(
+        self,
+        project_name: str,
+        auto_mode: bool = True,
+        grace_period: int = 3,
+        min_improvement_ratio: float = 0.1
+    ):
         """
         初始化自动化工作流
-        
+
         Args:
             project_name: 项目名称
             auto_mode: 是否启用自动模式
+            grace_period: 停滞判定的宽限迭代数
+            min_improvement_ratio: 宽限窗口内的最小提升比例,低于即判定停滞
         """
+        # 延迟导入: ProjectManager会连带拉起AI集成与HTTP栈,
+        # 仅查询状态/帮助的调用路径不必在模块导入时付出这笔开销
+        from .project_manager import ProjectManager
+
         self.project_name = project_name
         self.manager = ProjectManager(project_name)
         self.auto_mode = auto_mode
         self.max_auto_iterations = 10  # 最大自动迭代次数
         self.auto_iteration_count = 0
+        self.min_improvement_ratio = min_improvement_ratio
+        # 最近grace_period次迭代的评分,用于检测分数停滞
+        self._score_history: deque = deque(maxlen=grace_period)
+        # 上一次迭代的(阶段,评分,产出哈希)指纹,用于收敛检测
+        self._last_fingerprint = None
         
-    def run_auto_workflow(self) -> Dict[str, Any]:
+    def _run_loop(
+        self,
+        label: str,
+        advance_fn: Callable[[Dict[str, Any], Dict[str, Any]], bool],
+        extras: Optional[Dict[str, Any]] = None,
+        plateau_target: Optional[float] = None,
+        max_phases: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
-        运行自动化工作流
-        
+        三种工作流共享的迭代主循环
+
+        回退检查、阶段执行、停滞检测、阶段推进与结果记录只实现一份;
+        各工作流通过advance_fn策略回调决定何时进入下一阶段。
+
+        Args:
+            label: 迭代日志中的工作流名称
+            advance_fn: (status, phase_result) -> 是否进入下一阶段
+            extras: 合并进结果字典的额外字段
+            plateau_target: 停滞检测的目标分数,None表示不检测
+            max_phases: 最大推进阶段数,None表示不限制
+
         Returns:
             工作流执行结果
         """
-        print(f"🤖 开始自动化工作流：{self.project_name}")
-        print(f"🔄 自动模式：{'启用' if self.auto_mode else '禁用'}")
-        
         workflow_result = {
             'project_name': self.project_name,
+            **(extras or {}),
             'start_time': datetime.now().isoformat(),
             'phases_completed': [],
             'total_iterations': 0,
             'final_score': None,
             'status': 'IN_PROGRESS'
         }
-        
+
         try:
+            phase_count = 0
             while self.auto_iteration_count < self.max_auto_iterations:
+                if max_phases is not None and phase_count >= max_phases:
+                    break
                 self.auto_iteration_count += 1
-                print(f"\n🔄 第 {self.auto_iteration_count} 次自动迭代")
-                
+                log.info(f"\n🔄 第 {self.auto_iteration_count} 次{label}迭代")
+
                 # 检查项目状态
                 status = self.manager.get_current_status()
-                print(f"📍 当前阶段：{status['current_phase']}")
-                print(f"📊 当前评分：{status['latest_score']}")
-                
+                log.info(f"📍 当前阶段：{status['current_phase']}")
+                log.info(f"📊 当前评分：{status['latest_score']}")
+
                 # 检查是否需要回退
                 rollback_target = self.manager.check_rollback_needed()
                 if rollback_target:
-                    print(f"⚠️  检测到需要回退到：{rollback_target.value}")
+                    log.warning(f"⚠️  检测到需要回退到：{rollback_target.value}")
                     self.manager.rollback_to_phase(rollback_target, "自动检测到Critical问题")
                     continue
-                
-                # 执行当前阶段
-                phase_result = self._execute_current_phase()
+
+                # 执行当前阶段,使用本次迭代刚产生的评分做后续决策
+                phase_result = self._execute_current_phase(status)
                 workflow_result['total_iterations'] += 1
-                
-                # 检查是否可以进入下一阶段
-                if self.manager.check_phase_transition():
-                    print(f"✅ 阶段 {status['current_phase']} 完成，准备进入下一阶段")
+                new_score = phase_result['review_result']['score']
+
+                # 收敛检测: 阶段/评分/产出与上次迭代完全一致,说明再跑一轮
+                # 开发+评审必然得到同样结果,继续只是白烧API调用
+                fingerprint = (
+                    status['current_phase'],
+                    status['latest_score'],
+                    hashlib.blake2b(phase_result['dev_result'].encode('utf-8')).hexdigest()
+                )
+                if fingerprint == self._last_fingerprint:
+                    log.warning("⚠️  连续两次迭代的阶段/评分/产出完全一致，判定已收敛")
+                    workflow_result['status'] = 'CONVERGED'
+                    break
+                self._last_fingerprint = fingerprint
+
+                # 分数停滞检测: 宽限窗口内无实质提升则提前终止,节省API调用
+                if plateau_target is not None:
+                    if new_score is not None:
+                        self._score_history.append(new_score)
+                    if self._is_plateaued(plateau_target):
+                        log.warning(f"⚠️  评分已连续{self._score_history.maxlen}次迭代无实质提升，提前终止")
+                        workflow_result['status'] = 'PLATEAUED'
+                        break
+
+                # 检查是否可以进入下一阶段 (策略回调决定)
+                if advance_fn(status, phase_result):
+                    log.info(f"✅ 阶段 {status['current_phase']} 完成，准备进入下一阶段")
                     self.manager.force_next_phase()
-                    
+                    phase_count += 1
+
                     # 记录完成的阶段
                     workflow_result['phases_completed'].append({
                         'phase': status['current_phase'],
-                        'score': status['latest_score'],
+                        'score': new_score,
                         'iterations': status['phase_iteration']
                     })
-                    
+
                     # 检查是否完成所有阶段
                     new_status = self.manager.get_current_status()
                     if new_status['status'] == 'COMPLETED':
-                        print("🎉 所有阶段已完成！")
+                        log.info("🎉 所有阶段已完成！")
                         workflow_result['status'] = 'COMPLETED'
                         workflow_result['final_score'] = new_status['latest_score']
                         break
                 else:
-                    print(f"🔄 阶段 {status['current_phase']} 需要继续迭代")
+                    log.info(f"🔄 阶段 {status['current_phase']} 需要继续迭代")
                     self.manager.next_iteration()
-                
-                # 短暂延迟，避免过于频繁的操作
-                time.sleep(1)
-            
+
             # 检查是否因为达到最大迭代次数而停止
             if self.auto_iteration_count >= self.max_auto_iterations:
-                print(f"⚠️  达到最大自动迭代次数：{self.max_auto_iterations}")
+                log.warning(f"⚠️  达到最大{label}迭代次数：{self.max_auto_iterations}")
                 workflow_result['status'] = 'MAX_ITERATIONS_REACHED'
-            
+
         except Exception as e:
-            print(f"❌ 自动化工作流执行失败：{e}")
+            log.error(f"❌ {label}工作流执行失败：{e}")
             workflow_result['status'] = 'ERROR'
             workflow_result['error'] = str(e)
-        
+
         workflow_result['end_time'] = datetime.now().isoformat()
         return workflow_result
-    
-    def _execute_current_phase(self) -> Dict[str, Any]:
+
+    def run_auto_workflow(self) -> Dict[str, Any]:
+        """
+        运行自动化工作流
+
+        Returns:
+            工作流执行结果
+        """
+        log.info(f"🤖 开始自动化工作流：{self.project_name}")
+        log.info(f"🔄 自动模式：{'启用' if self.auto_mode else '禁用'}")
+        return self._run_loop(
+            label="自动",
+            advance_fn=lambda status, result: self.manager.check_phase_transition()
+        )
+
+    def _is_plateaued(self, target_score: float = 100.0) -> bool:
+        """
+        判断评分是否已停滞
+
+        宽限窗口填满后,若窗口内的提升量相对初始差距的比例低于
+        min_improvement_ratio,则认为继续迭代只是浪费API调用。
+
+        Args:
+            target_score: 目标分数(用于归一化提升比例)
+
+        Returns:
+            是否已停滞
+        """
+        history = self._score_history
+        if history.maxlen is None or len(history) < history.maxlen:
+            return False
+        improvement = history[-1] - history[0]
+        initial_gap = max(1.0, target_score - history[0])
+        return improvement / initial_gap < self.min_improvement_ratio
+
+    def _execute_current_phase(self, status: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         执行当前阶段（开发 + 评审）
-        
+
+        Args:
+            status: 调用方已获取的状态字典(避免重复读取)
+
         Returns:
             阶段执行结果
         """
-        status = self.manager.get_current_status()
+        if status is None:
+            status = self.manager.get_current_status()
         current_phase = status['current_phase']
         
-        print(f"🎨 执行阶段：{current_phase}")
+        log.info(f"🎨 执行阶段：{current_phase}")
         
         # 1. 开发模式 - 生成内容
-        print("   📝 开发模式：生成内容...")
+        log.info("   📝 开发模式：生成内容...")
         self.manager.set_mode("developer")
         dev_result = self.manager.execute_phase()
-        print(f"   ✅ 开发完成：{dev_result[:100]}...")
+        log.info(f"   ✅ 开发完成：{dev_result[:100]}...")
         
         # 2. 评审模式 - 评估内容
-        print("   🔍 评审模式：评估内容...")
+        log.info("   🔍 评审模式：评估内容...")
         self.manager.set_mode("reviewer")
         review_result = self.manager.review_phase()
-        print(f"   📊 评审完成：{review_result['score']}分")
+        log.info(f"   📊 评审完成：{review_result['score']}分")
         
         # 3. 显示评审详情
         if review_result['issues']:
-            print("   ⚠️  发现的问题：")
+            log.warning("   ⚠️  发现的问题：")
             for issue in review_result['issues']:
-                print(f"      - {issue['level']}: {issue['description']}")
+                log.info(f"      - {issue['level']}: {issue['description']}")
         
         if review_result['improvements']:
-            print("   💡 改进建议：")
+            log.info("   💡 改进建议：")
             for improvement in review_result['improvements']:
-                print(f"      - {improvement}")
+                log.info(f"      - {improvement}")
         
         return {
             'phase': current_phase,
@@ -150,174 +245,45 @@ class AutoWorkflow:
     def run_smart_workflow(self, target_score: float = 85.0) -> Dict[str, Any]:
         """
         智能工作流 - 达到目标分数后自动进入下一阶段
-        
+
         Args:
             target_score: 目标分数
-            
+
         Returns:
             工作流执行结果
         """
-        print(f"🧠 开始智能工作流：{self.project_name}")
-        print(f"🎯 目标分数：{target_score}")
-        
-        workflow_result = {
-            'project_name': self.project_name,
-            'target_score': target_score,
-            'start_time': datetime.now().isoformat(),
-            'phases_completed': [],
-            'total_iterations': 0,
-            'final_score': None,
-            'status': 'IN_PROGRESS'
-        }
-        
-        try:
-            while self.auto_iteration_count < self.max_auto_iterations:
-                self.auto_iteration_count += 1
-                print(f"\n🔄 第 {self.auto_iteration_count} 次智能迭代")
-                
-                # 检查项目状态
-                status = self.manager.get_current_status()
-                current_score = status['latest_score']
-                
-                print(f"📍 当前阶段：{status['current_phase']}")
-                print(f"📊 当前评分：{current_score}")
-                print(f"🎯 目标分数：{target_score}")
-                
-                # 检查是否需要回退
-                rollback_target = self.manager.check_rollback_needed()
-                if rollback_target:
-                    print(f"⚠️  检测到需要回退到：{rollback_target.value}")
-                    self.manager.rollback_to_phase(rollback_target, "自动检测到Critical问题")
-                    continue
-                
-                # 执行当前阶段
-                phase_result = self._execute_current_phase()
-                workflow_result['total_iterations'] += 1
-                
-                # 检查是否达到目标分数
-                if current_score and current_score >= target_score:
-                    print(f"🎉 达到目标分数 {target_score}，准备进入下一阶段")
-                    self.manager.force_next_phase()
-                    
-                    # 记录完成的阶段
-                    workflow_result['phases_completed'].append({
-                        'phase': status['current_phase'],
-                        'score': current_score,
-                        'iterations': status['phase_iteration']
-                    })
-                    
-                    # 检查是否完成所有阶段
-                    new_status = self.manager.get_current_status()
-                    if new_status['status'] == 'COMPLETED':
-                        print("🎉 所有阶段已完成！")
-                        workflow_result['status'] = 'COMPLETED'
-                        workflow_result['final_score'] = new_status['latest_score']
-                        break
-                else:
-                    print(f"🔄 未达到目标分数，继续迭代")
-                    self.manager.next_iteration()
-                
-                # 短暂延迟
-                time.sleep(1)
-            
-            # 检查是否因为达到最大迭代次数而停止
-            if self.auto_iteration_count >= self.max_auto_iterations:
-                print(f"⚠️  达到最大智能迭代次数：{self.max_auto_iterations}")
-                workflow_result['status'] = 'MAX_ITERATIONS_REACHED'
-        
-        except Exception as e:
-            print(f"❌ 智能工作流执行失败：{e}")
-            workflow_result['status'] = 'ERROR'
-            workflow_result['error'] = str(e)
-        
-        workflow_result['end_time'] = datetime.now().isoformat()
-        return workflow_result
-    
+        log.info(f"🧠 开始智能工作流：{self.project_name}")
+        log.info(f"🎯 目标分数：{target_score}")
+
+        def reached_target(status: Dict[str, Any], result: Dict[str, Any]) -> bool:
+            score = result['review_result']['score']
+            return score is not None and score >= target_score
+
+        return self._run_loop(
+            label="智能",
+            advance_fn=reached_target,
+            extras={'target_score': target_score},
+            plateau_target=target_score
+        )
+
     def run_continuous_improvement(self, max_phases: int = 5) -> Dict[str, Any]:
         """
         持续改进工作流 - 在达到通过分数后继续改进
-        
+
         Args:
             max_phases: 最大阶段数
-            
+
         Returns:
             工作流执行结果
         """
-        print(f"🚀 开始持续改进工作流：{self.project_name}")
-        
-        workflow_result = {
-            'project_name': self.project_name,
-            'start_time': datetime.now().isoformat(),
-            'phases_completed': [],
-            'total_iterations': 0,
-            'final_score': None,
-            'status': 'IN_PROGRESS'
-        }
-        
-        try:
-            phase_count = 0
-            while phase_count < max_phases and self.auto_iteration_count < self.max_auto_iterations:
-                self.auto_iteration_count += 1
-                print(f"\n🔄 第 {self.auto_iteration_count} 次改进迭代")
-                
-                # 检查项目状态
-                status = self.manager.get_current_status()
-                current_score = status['latest_score']
-                
-                print(f"📍 当前阶段：{status['current_phase']}")
-                print(f"📊 当前评分：{current_score}")
-                
-                # 检查是否需要回退
-                rollback_target = self.manager.check_rollback_needed()
-                if rollback_target:
-                    print(f"⚠️  检测到需要回退到：{rollback_target.value}")
-                    self.manager.rollback_to_phase(rollback_target, "自动检测到Critical问题")
-                    continue
-                
-                # 执行当前阶段
-                phase_result = self._execute_current_phase()
-                workflow_result['total_iterations'] += 1
-                
-                # 检查是否可以进入下一阶段
-                if self.manager.check_phase_transition():
-                    print(f"✅ 阶段 {status['current_phase']} 完成，准备进入下一阶段")
-                    self.manager.force_next_phase()
-                    phase_count += 1
-                    
-                    # 记录完成的阶段
-                    workflow_result['phases_completed'].append({
-                        'phase': status['current_phase'],
-                        'score': current_score,
-                        'iterations': status['phase_iteration']
-                    })
-                    
-                    # 检查是否完成所有阶段
-                    new_status = self.manager.get_current_status()
-                    if new_status['status'] == 'COMPLETED':
-                        print("🎉 所有阶段已完成！")
-                        workflow_result['status'] = 'COMPLETED'
-                        workflow_result['final_score'] = new_status['latest_score']
-                        break
-                else:
-                    print(f"🔄 继续改进当前阶段")
-                    self.manager.next_iteration()
-                
-                # 短暂延迟
-                time.sleep(1)
-            
-            # 检查是否因为达到最大迭代次数而停止
-            if self.auto_iteration_count >= self.max_auto_iterations:
-                print(f"⚠️  达到最大改进迭代次数：{self.max_auto_iterations}")
-                workflow_result['status'] = 'MAX_ITERATIONS_REACHED'
-        
-        except Exception as e:
-            print(f"❌ 持续改进工作流执行失败：{e}")
-            workflow_result['status'] = 'ERROR'
-            workflow_result['error'] = str(e)
-        
-        workflow_result['end_time'] = datetime.now().isoformat()
-        return workflow_result
-    
+        log.info(f"🚀 开始持续改进工作流：{self.project_name}")
+        return self._run_loop(
+            label="改进",
+            advance_fn=lambda status, result: self.manager.check_phase_transition(),
+            plateau_target=100.0,
+            max_phases=max_phases
+        )
+
     def get_workflow_status(self) -> Dict[str, Any]:
         """
         获取工作流状态
@@ -0,0 +1,76 @@
+"""
+异步自动化工作流模块
+在asyncio程序中复用同步AutoWorkflow,将整个工作流循环移入线程池执行
+"""
+import asyncio
+from typing import Dict, Any
+
+from .auto_workflow import AutoWorkflow
+
+
+class AutoWorkflowAsync:
+    """异步自动化工作流管理器
+
+    AutoWorkflow的异步门面:工作流的停滞检测、收敛指纹和日志都在
+    同步的AutoWorkflow._run_loop中实现,这里不重复这些逻辑,而是把
+    整个循环通过asyncio.to_thread移出事件循环,供异步调用方await。
+
+    工作流内部的开发→评审存在数据依赖,本就只能顺序执行,因此单个
+    工作流无法从事件循环内的细粒度并发获益;并发应发生在工作流之间
+    (多个项目各自await一个实例)。
+    """
+
+    def __init__(self, project_name: str, auto_mode: bool = True):
+        """
+        初始化异步自动化工作流
+
+        Args:
+            project_name: 项目名称
+            auto_mode: 是否启用自动模式
+        """
+        self.project_name = project_name
+        self._workflow = AutoWorkflow(project_name, auto_mode=auto_mode)
+        self.manager = self._workflow.manager
+        self.auto_mode = auto_mode
+
+    async def run_auto_workflow(self) -> Dict[str, Any]:
+        """
+        运行异步自动化工作流
+
+        Returns:
+            工作流执行结果
+        """
+        return await asyncio.to_thread(self._workflow.run_auto_workflow)
+
+    async def run_smart_workflow(self, target_score: float = 85.0) -> Dict[str, Any]:
+        """
+        异步智能工作流 - 达到目标分数后自动进入下一阶段
+
+        Args:
+            target_score: 目标分数
+
+        Returns:
+            工作流执行结果
+        """
+        return await asyncio.to_thread(self._workflow.run_smart_workflow, target_score)
+
+    async def run_continuous_improvement(self, max_phases: int = 5) -> Dict[str, Any]:
+        """
+        异步持续改进工作流
+
+        Args:
+            max_phases: 最大处理阶段数
+
+        Returns:
+            工作流执行结果
+        """
+        return await asyncio.to_thread(self._workflow.run_continuous_improvement, max_phases)
+
+    def get_workflow_status(self) -> Dict[str, Any]:
+        """
+        获取工作流状态(纯内存读取,无需线程池)
+
+        Returns:
+            工作流状态
+        """
+        return self._workflow.get_workflow_status()
@@ -0,0 +1,181 @@
+"""
+批量任务运行器
+通过Anthropic Message Batches API批量提交独立的生成/评审请求
+适用于演示、CI等不需要交互式延迟的场景(成本约为实时调用的50%)
+"""
+import json
+import time
+import urllib.request
+import urllib.error
+from typing import Dict, List, Any, Optional
+
+from .claude_provider import ClaudeProvider
+from .config_loader import get_config_loader
+
+
+class BatchRunner:
+    """Message Batches API运行器"""
+
+    # 轮询间隔(秒)
+    POLL_INTERVAL = 5
+    # 最大等待时间(秒)
+    MAX_WAIT_SECONDS = 3600
+
+    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+        """
+        初始化批量运行器
+
+        Args:
+            api_key: Anthropic API密钥(默认从配置加载)
+            model: 使用的模型名称
+        """
+        config = get_config_loader().get_claude_config()
+        self.api_key = api_key or config.get("api_key")
+        self.model = model or config.get("model") or ClaudeProvider.DEFAULT_MODEL
+        self.api_base = config.get("api_base") or ClaudeProvider.API_BASE_URL
+
+    def build_request(
+        self,
+        custom_id: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 1.0
+    ) -> Dict[str, Any]:
+        """
+        构建单个批量请求项
+
+        Args:
+            custom_id: 请求标识,批内唯一,仅限字母数字下划线连字符(如 "BASIC_DESIGN")
+            prompt: 用户提示词
+            system_prompt: 系统提示词
+            max_tokens: 最大生成token数
+            temperature: 温度参数
+
+        Returns:
+            批量请求项字典
+        """
+        params = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        if system_prompt:
+            params["system"] = system_prompt
+        return {"custom_id": custom_id, "params": params}
+
+    def submit_phases(self, items: List[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        提交一批请求并等待全部完成
+
+        Args:
+            items: build_request构建的请求项列表
+
+        Returns:
+            custom_id到生成文本的映射
+
+        Raises:
+            RuntimeError: 批量任务提交或轮询失败
+        """
+        if not items:
+            return {}
+
+        # 1. 创建批量任务
+        batch = self._request("POST", "/messages/batches", {"requests": items})
+        batch_id = batch["id"]
+        print(f"📤 批量任务已提交: {batch_id} ({len(items)}个请求)")
+
+        # 2. 轮询直到处理结束
+        deadline = time.time() + self.MAX_WAIT_SECONDS
+        while True:
+            batch = self._request("GET", f"/messages/batches/{batch_id}")
+            if batch.get("processing_status") == "ended":
+                break
+            if time.time() > deadline:
+                raise RuntimeError(f"批量任务超时: {batch_id}")
+            time.sleep(self.POLL_INTERVAL)
+
+        # 3. 拉取结果(JSONL格式)
+        results_url = batch.get("results_url")
+        if not results_url:
+            raise RuntimeError(f"批量任务无结果URL: {batch_id}")
+
+        results: Dict[str, str] = {}
+        for line in self._fetch_raw(results_url).splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            custom_id = entry.get("custom_id", "")
+            result = entry.get("result", {})
+            if result.get("type") == "succeeded":
+                message = result.get("message", {})
+                content = "".join(
+                    block.get("text", "")
+                    for block in message.get("content", [])
+                    if block.get("type") == "text"
+                )
+                results[custom_id] = content
+            else:
+                error = result.get("error", {})
+                results[custom_id] = f"[错误] {error.get('message', result.get('type'))}"
+
+        print(f"📥 批量任务完成: {len(results)}个结果")
+        return results
+
+    def _request(self, method: str, endpoint: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        发送HTTP请求到Batches API
+
+        Args:
+            method: HTTP方法
+            endpoint: API端点
+            payload: 请求数据(POST时使用)
+
+        Returns:
+            响应数据
+
+        Raises:
+            RuntimeError: 请求失败
+        """
+        if not self.api_key:
+            raise ValueError("Claude API密钥未配置。请设置ANTHROPIC_API_KEY环境变量")
+
+        url = f"{self.api_base}{endpoint}"
+        headers = {
+            "Content-Type": "application/json",
+            "x-api-key": self.api_key,
+            "anthropic-version": ClaudeProvider.API_VERSION
+        }
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        req = urllib.request.Request(url, data=data, headers=headers, method=method)
+
+        try:
+            with urllib.request.urlopen(req, timeout=120) as response:
+                return json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            error_body = e.read().decode('utf-8')
+            try:
+                error_msg = json.loads(error_body).get('error', {}).get('message', error_body)
+            except (ValueError, AttributeError):
+                error_msg = error_body
+            raise RuntimeError(f"HTTP {e.code}: {error_msg}")
+        except urllib.error.URLError as e:
+            raise RuntimeError(f"网络错误: {str(e.reason)}")
+
+    def _fetch_raw(self, url: str) -> str:
+        """
+        拉取结果文件的原始内容
+
+        Args:
+            url: 结果文件URL
+
+        Returns:
+            原始文本内容
+        """
+        req = urllib.request.Request(url, headers={
+            "x-api-key": self.api_key,
+            "anthropic-version": ClaudeProvider.API_VERSION
+        })
+        with urllib.request.urlopen(req, timeout=120) as response:
+            return response.read().decode('utf-8')
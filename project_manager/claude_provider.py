@@ -2,14 +2,38 @@
 Claude API Provider实现
 使用Anthropic Claude API进行AI生成
 """
+import dataclasses
+import gzip
+import hashlib
+import http.client
 import json
 import os
-from typing import Dict, Any, Optional, List
-import urllib.request
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, Optional, List
 import urllib.error
+import urllib.parse
+import urllib.request
 
 from .ai_provider import AIProvider, AIMessage, AIResponse
 
+try:
+    # 可选依赖: orjson的C实现编码快5-10倍,直接产出UTF-8字节
+    import orjson
+
+    def _encode_payload(payload: Dict[str, Any]) -> bytes:
+        """编码请求体为UTF-8字节(orjson)"""
+        return orjson.dumps(payload)
+except ImportError:
+    # 编码器实例化一次复用: 紧凑分隔符+不转义非ASCII,中文提示词体积显著更小
+    _compact_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+    def _encode_payload(payload: Dict[str, Any]) -> bytes:
+        """编码请求体为UTF-8字节(stdlib紧凑编码回退)"""
+        return _compact_encode(payload).encode('utf-8')
+
 
 class ClaudeProvider(AIProvider):
     """Claude API Provider"""
@@ -18,6 +42,14 @@ class ClaudeProvider(AIProvider):
     DEFAULT_MODEL = "claude-3-5-sonnet-20241022"
     API_BASE_URL = "https://api.anthropic.com/v1"
     API_VERSION = "2023-06-01"
+    # 提示词缓存beta特性标识
+    PROMPT_CACHING_BETA = "prompt-caching-2024-07-31"
+
+    # 响应记忆缓存的最大条目数(FIFO淘汰)
+    CHAT_CACHE_SIZE = 128
+
+    # 限流/服务端错误的最大重试次数(指数退避)
+    MAX_RETRIES = 3
 
     def __init__(
         self,
@@ -43,6 +75,60 @@ class ClaudeProvider(AIProvider):
         if not self.api_key:
             self.api_key = os.getenv("ANTHROPIC_API_KEY")
 
+        # 持久HTTP连接: 进程内复用TCP/TLS连接,省去每次请求的握手开销。
+        # http.client连接不是线程安全的,按线程各持一条(并发评审/异步工作流
+        # 中每个工作线程复用自己的连接,互不干扰)
+        self._split_base = urllib.parse.urlsplit(self.api_base)
+        self._local = threading.local()
+
+        # 响应记忆缓存: 相同输入(模型/温度/提示词/消息)的确定性调用直接复用
+        self._chat_cache: "OrderedDict[bytes, AIResponse]" = OrderedDict()
+        self._chat_cache_lock = threading.Lock()
+
+        # 请求头在实例生命周期内不变,构造一次后按请求类型复用
+        self._headers = {
+            "Content-Type": "application/json",
+            "x-api-key": self.api_key,
+            "anthropic-version": self.API_VERSION,
+            "Connection": "keep-alive",
+            "Accept-Encoding": "gzip"
+        }
+        self._stream_headers = {
+            "Content-Type": "application/json",
+            "x-api-key": self.api_key,
+            "anthropic-version": self.API_VERSION,
+            "Accept": "text/event-stream"
+        }
+
+    def _get_connection(self) -> http.client.HTTPConnection:
+        """获取(必要时建立)当前线程到API端点的持久连接"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            if self._split_base.scheme == "https":
+                connection = http.client.HTTPSConnection(
+                    self._split_base.hostname, self._split_base.port, timeout=120
+                )
+            else:
+                connection = http.client.HTTPConnection(
+                    self._split_base.hostname, self._split_base.port, timeout=120
+                )
+            self._local.connection = connection
+        return connection
+
+    def _close_connection(self) -> None:
+        """关闭当前线程的持久连接(连接失效或Provider销毁时调用)"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+            self._local.connection = None
+
+    def close(self) -> None:
+        """关闭当前线程的持久连接,支持with语句或显式释放"""
+        self._close_connection()
+
     def generate(
         self,
         prompt: str,
@@ -101,6 +187,18 @@ class ClaudeProvider(AIProvider):
         if not self.validate_config():
             raise ValueError("Claude API密钥未配置。请设置ANTHROPIC_API_KEY环境变量或传入api_key参数")
 
+        # 记忆缓存: temperature=0的调用是输入的确定性函数,相同输入可直接
+        # 复用上次响应(回退后重跑未变的内容时省掉整个网络往返);
+        # 非零温度的调用需显式传use_cache=True才参与缓存
+        use_cache = kwargs.pop("use_cache", False) or temperature == 0
+        cache_key = None
+        if use_cache:
+            cache_key = self._chat_cache_key(messages, system_prompt, max_tokens, temperature, kwargs)
+            with self._chat_cache_lock:
+                cached = self._chat_cache.get(cache_key)
+            if cached is not None:
+                return dataclasses.replace(cached)
+
         # 构建请求体
         payload = {
             "model": self.model,
@@ -112,7 +210,7 @@ class ClaudeProvider(AIProvider):
             ]
         }
 
-        # 添加系统提示词
+        # 添加系统提示词 (支持字符串或带cache_control的结构化block列表)
         if system_prompt:
             payload["system"] = system_prompt
 
@@ -124,42 +222,186 @@ class ClaudeProvider(AIProvider):
         if "stop_sequences" in kwargs:
             payload["stop_sequences"] = kwargs["stop_sequences"]
 
+        # 检测是否使用提示词缓存,需要附加beta请求头
+        extra_headers = {}
+        if self._uses_prompt_cache(payload):
+            extra_headers["anthropic-beta"] = self.PROMPT_CACHING_BETA
+
         # 发送请求
         try:
-            response_data = self._make_request("/messages", payload)
-            return self._parse_response(response_data)
+            response_data = self._make_request("/messages", payload, extra_headers)
+            response = self._parse_response(response_data)
         except Exception as e:
             raise RuntimeError(f"Claude API调用失败: {str(e)}")
 
-    def _make_request(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if cache_key is not None:
+            with self._chat_cache_lock:
+                self._chat_cache[cache_key] = response
+                while len(self._chat_cache) > self.CHAT_CACHE_SIZE:
+                    self._chat_cache.popitem(last=False)
+        return response
+
+    def _chat_cache_key(
+        self,
+        messages: List[AIMessage],
+        system_prompt: Any,
+        max_tokens: int,
+        temperature: float,
+        extra_params: Optional[Dict[str, Any]] = None
+    ) -> bytes:
+        """计算chat调用的记忆缓存键(输入字段的稳定哈希,含top_p等附加参数)"""
+        key_src = json.dumps({
+            "m": self.model,
+            "mt": max_tokens,
+            "t": temperature,
+            "sys": system_prompt,
+            "msgs": [(msg.role, msg.content) for msg in messages],
+            # 附加采样参数(top_p/top_k/stop_sequences等)同样影响输出,
+            # 必须参与键计算,否则仅这些参数不同的调用会串缓存
+            "kw": extra_params or {}
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.blake2b(key_src.encode('utf-8'), digest_size=16).digest()
+
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 1.0,
+        **kwargs
+    ) -> Iterator[str]:
         """
-        发送HTTP请求到Claude API
+        流式生成AI响应,逐段产出文本增量
+
+        Args:
+            prompt: 用户提示词
+            system_prompt: 系统提示词
+            max_tokens: 最大生成token数
+            temperature: 温度参数(0-1)
+            **kwargs: 其他模型参数
+
+        Yields:
+            生成的文本增量
+        """
+        messages = [AIMessage(role="user", content=prompt)]
+        yield from self.chat_stream(
+            messages=messages,
+            system_prompt=system_prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            **kwargs
+        )
+
+    def chat_stream(
+        self,
+        messages: List[AIMessage],
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 4096,
+        temperature: float = 1.0,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        流式多轮对话 (SSE)
+
+        相比chat()可以在首个token到达时就开始消费输出,
+        将首字节延迟从完整生成时间降低到网络往返时间。
+
+        Args:
+            messages: 对话历史消息列表
+            system_prompt: 系统提示词
+            max_tokens: 最大生成token数
+            temperature: 温度参数(0-1)
+            **kwargs: 其他模型参数
+
+        Yields:
+            生成的文本增量
+
+        Raises:
+            ValueError: API配置无效
+            RuntimeError: API调用失败
+        """
+        if not self.validate_config():
+            raise ValueError("Claude API密钥未配置。请设置ANTHROPIC_API_KEY环境变量或传入api_key参数")
+
+        payload = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True,
+            "messages": [
+                {"role": msg.role, "content": msg.content}
+                for msg in messages
+            ]
+        }
+        if system_prompt:
+            payload["system"] = system_prompt
+        if "top_p" in kwargs:
+            payload["top_p"] = kwargs["top_p"]
+        if "top_k" in kwargs:
+            payload["top_k"] = kwargs["top_k"]
+        if "stop_sequences" in kwargs:
+            payload["stop_sequences"] = kwargs["stop_sequences"]
+
+        extra_headers = {}
+        if self._uses_prompt_cache(payload):
+            extra_headers["anthropic-beta"] = self.PROMPT_CACHING_BETA
+
+        try:
+            yield from self._stream_request("/messages", payload, extra_headers)
+        except RuntimeError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Claude API流式调用失败: {str(e)}")
+
+    def _stream_request(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        extra_headers: Optional[Dict[str, str]] = None
+    ) -> Iterator[str]:
+        """
+        发送流式HTTP请求并解析SSE事件流
 
         Args:
             endpoint: API端点
-            payload: 请求数据
+            payload: 请求数据(需包含"stream": True)
+            extra_headers: 额外的请求头
 
-        Returns:
-            响应数据
+        Yields:
+            content_block_delta事件中的文本增量
 
         Raises:
-            urllib.error.HTTPError: HTTP请求失败
+            RuntimeError: HTTP请求失败
         """
         url = f"{self.api_base}{endpoint}"
-        headers = {
-            "Content-Type": "application/json",
-            "x-api-key": self.api_key,
-            "anthropic-version": self.API_VERSION
-        }
+        headers = self._stream_headers
+        if extra_headers:
+            headers = {**headers, **extra_headers}
 
-        # 构建请求
-        data = json.dumps(payload).encode('utf-8')
+        data = _encode_payload(payload)
         req = urllib.request.Request(url, data=data, headers=headers, method='POST')
 
         try:
-            with urllib.request.urlopen(req, timeout=120) as response:
-                response_data = json.loads(response.read().decode('utf-8'))
-                return response_data
+            with urllib.request.urlopen(req, timeout=300) as response:
+                for raw_line in response:
+                    line = raw_line.decode('utf-8').strip()
+                    # SSE格式: "event: xxx" / "data: {...}" / 空行分隔
+                    if not line.startswith("data:"):
+                        continue
+                    data_str = line[5:].strip()
+                    if not data_str:
+                        continue
+                    event = json.loads(data_str)
+                    event_type = event.get("type")
+                    if event_type == "content_block_delta":
+                        delta = event.get("delta", {})
+                        if delta.get("type") == "text_delta":
+                            yield delta.get("text", "")
+                    elif event_type == "message_stop":
+                        break
+                    elif event_type == "error":
+                        error = event.get("error", {})
+                        raise RuntimeError(f"流式错误: {error.get('message', '未知错误')}")
         except urllib.error.HTTPError as e:
             error_body = e.read().decode('utf-8')
             try:
@@ -170,7 +412,76 @@ class ClaudeProvider(AIProvider):
             raise RuntimeError(f"HTTP {e.code}: {error_msg}")
         except urllib.error.URLError as e:
             raise RuntimeError(f"网络错误: {str(e.reason)}")
-        except Exception as e:
+
+    @staticmethod
+    def _uses_prompt_cache(payload: Dict[str, Any]) -> bool:
+        """检查请求体中是否包含cache_control缓存断点"""
+        system = payload.get("system")
+        if isinstance(system, list):
+            if any(isinstance(block, dict) and "cache_control" in block for block in system):
+                return True
+        for message in payload.get("messages", []):
+            content = message.get("content")
+            if isinstance(content, list):
+                if any(isinstance(block, dict) and "cache_control" in block for block in content):
+                    return True
+        return False
+
+    def _make_request(self, endpoint: str, payload: Dict[str, Any], extra_headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        发送HTTP请求到Claude API
+
+        Args:
+            endpoint: API端点
+            payload: 请求数据
+
+        Returns:
+            响应数据
+
+        Raises:
+            RuntimeError: HTTP请求失败
+        """
+        headers = self._headers
+        if extra_headers:
+            headers = {**headers, **extra_headers}
+
+        path = f"{self._split_base.path}{endpoint}"
+        data = _encode_payload(payload)
+
+        # 持久连接可能被服务端关闭(keep-alive过期),失败时重连重试;
+        # 429/5xx按指数退避加抖动重试,节奏控制收敛在传输层,工作流层无需限速
+        for attempt in range(self.MAX_RETRIES + 1):
+            conn = self._get_connection()
+            try:
+                conn.request('POST', path, body=data, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, ConnectionError, OSError) as e:
+                self._close_connection()
+                if attempt == self.MAX_RETRIES:
+                    raise RuntimeError(f"网络错误: {str(e)}")
+                continue
+
+            if (response.status == 429 or response.status >= 500) and attempt < self.MAX_RETRIES:
+                time.sleep(min(2 ** attempt, 30) + random.random())
+                continue
+            break
+
+        if response.getheader("Content-Encoding", "").lower() == "gzip":
+            body = gzip.decompress(body)
+
+        if response.status >= 400:
+            error_body = body.decode('utf-8')
+            try:
+                error_data = json.loads(error_body)
+                error_msg = error_data.get('error', {}).get('message', error_body)
+            except ValueError:
+                error_msg = error_body
+            raise RuntimeError(f"HTTP {response.status}: {error_msg}")
+
+        try:
+            return json.loads(body)
+        except ValueError as e:
             raise RuntimeError(f"请求失败: {str(e)}")
 
     def _parse_response(self, response_data: Dict[str, Any]) -> AIResponse:
@@ -183,19 +494,24 @@ class ClaudeProvider(AIProvider):
         Returns:
             AI响应对象
         """
-        # 提取内容
-        content = ""
-        if "content" in response_data and len(response_data["content"]) > 0:
-            # Claude返回的content是一个列表
-            for content_block in response_data["content"]:
-                if content_block.get("type") == "text":
-                    content += content_block.get("text", "")
-
-        # 提取使用量信息
+        # 提取内容 (单block是常见情形,直接取值;多block用join线性拼接)
+        blocks = response_data.get("content") or []
+        if len(blocks) == 1 and blocks[0].get("type") == "text":
+            content = blocks[0].get("text", "")
+        else:
+            content = "".join(
+                block.get("text", "")
+                for block in blocks
+                if block.get("type") == "text"
+            )
+
+        # 提取使用量信息 (包含提示词缓存命中统计,便于验证缓存是否生效)
         usage = response_data.get("usage", {})
         usage_dict = {
             "input_tokens": usage.get("input_tokens", 0),
-            "output_tokens": usage.get("output_tokens", 0)
+            "output_tokens": usage.get("output_tokens", 0),
+            "cache_read_input_tokens": usage.get("cache_read_input_tokens", 0),
+            "cache_creation_input_tokens": usage.get("cache_creation_input_tokens", 0)
         }
 
         # 构建响应对象
@@ -2,10 +2,49 @@
 配置加载器
 从环境变量和配置文件加载AI Provider配置
 """
+import functools
 import os
+import re
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 
+# .env键值行: KEY=value,值可为双引号/单引号包裹或裸值;注释行不匹配。
+# 空白类只用[ \t],避免\s跨行吞掉换行符导致空值行粘连下一行
+_ENV_LINE_RE = re.compile(
+    r'^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*'
+    r'(?:"([^"]*)"|\'([^\']*)\'|(.*?))[ \t]*$',
+    re.M
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _find_env_file_cached(cwd: str) -> Optional[Path]:
+    """
+    查找.env文件(按工作目录缓存,重复实例化不再逐级stat探测)
+
+    Args:
+        cwd: 当前工作目录
+
+    Returns:
+        .env文件路径,找不到返回None
+    """
+    # 从当前目录开始向上查找
+    current = Path(cwd)
+    while current != current.parent:
+        env_path = current / ".env"
+        if env_path.exists():
+            return env_path
+        current = current.parent
+
+    # 尝试项目根目录
+    project_root = Path(__file__).parent.parent
+    env_path = project_root / ".env"
+    if env_path.exists():
+        return env_path
+
+    return None
+
 
 class ConfigLoader:
     """配置加载器类"""
@@ -18,75 +57,76 @@ class ConfigLoader:
             env_file: .env文件路径,默认为项目根目录的.env
         """
         self.env_file = env_file or self._find_env_file()
+        # 解析结果缓存,仅当.env的mtime变化时失效
+        self._env_mtime_ns: Optional[int] = None
+        self._claude_config: Optional[Dict[str, Any]] = None
         self._load_env_file()
 
     def _find_env_file(self) -> Optional[Path]:
         """
-        查找.env文件
+        查找.env文件(结果按工作目录缓存)
 
         Returns:
             .env文件路径,如果找不到返回None
         """
-        # 从当前目录开始向上查找
-        current = Path.cwd()
-        while current != current.parent:
-            env_path = current / ".env"
-            if env_path.exists():
-                return env_path
-            current = current.parent
-
-        # 尝试项目根目录
-        project_root = Path(__file__).parent.parent
-        env_path = project_root / ".env"
-        if env_path.exists():
-            return env_path
+        return _find_env_file_cached(str(Path.cwd()))
 
+    def _env_file_mtime(self) -> Optional[int]:
+        """获取.env文件的mtime(纳秒),文件不存在时返回None"""
+        if self.env_file and Path(self.env_file).exists():
+            return Path(self.env_file).stat().st_mtime_ns
         return None
 
+    def _refresh_if_changed(self) -> None:
+        """检查.env文件是否变化,变化则重新解析并清除缓存"""
+        mtime = self._env_file_mtime()
+        if mtime != self._env_mtime_ns:
+            self._claude_config = None
+            self._load_env_file()
+
     def _load_env_file(self):
-        """从.env文件加载环境变量"""
-        if not self.env_file or not Path(self.env_file).exists():
+        """从.env文件加载环境变量(按mtime缓存,未变化时跳过解析)"""
+        mtime = self._env_file_mtime()
+        if mtime is not None and mtime == self._env_mtime_ns:
+            return
+        self._env_mtime_ns = mtime
+        self._claude_config = None
+
+        if not self.env_file or mtime is None:
             return
 
         try:
-            with open(self.env_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    # 跳过空行和注释
-                    if not line or line.startswith('#'):
-                        continue
-
-                    # 解析键值对
-                    if '=' in line:
-                        key, value = line.split('=', 1)
-                        key = key.strip()
-                        value = value.strip()
-                        # 去除引号
-                        if value.startswith('"') and value.endswith('"'):
-                            value = value[1:-1]
-                        elif value.startswith("'") and value.endswith("'"):
-                            value = value[1:-1]
-
-                        # 只在环境变量未设置时才设置
-                        if key not in os.environ:
-                            os.environ[key] = value
+            # 整体读入后单趟正则解析: 一次read系统调用,引号剥离由匹配组完成
+            text = Path(self.env_file).read_text(encoding='utf-8')
+            for match in _ENV_LINE_RE.finditer(text):
+                key = match.group(1)
+                # 三个值组互斥: 双引号/单引号/裸值,取命中的那个
+                value = next(
+                    (group for group in match.group(2, 3, 4) if group is not None),
+                    ""
+                )
+                # 只在环境变量未设置时才设置
+                os.environ.setdefault(key, value)
         except Exception as e:
             print(f"⚠️  加载.env文件失败: {e}")
 
     def get_claude_config(self) -> Dict[str, Any]:
         """
-        获取Claude API配置
+        获取Claude API配置 (结果缓存,仅.env文件变化时重建)
 
         Returns:
-            配置字典
+            只读配置字典
         """
-        return {
-            "api_key": os.getenv("ANTHROPIC_API_KEY"),
-            "model": os.getenv("CLAUDE_MODEL", "claude-3-5-sonnet-20241022"),
-            "api_base": os.getenv("ANTHROPIC_API_BASE"),
-            "max_tokens": int(os.getenv("MAX_TOKENS", "4096")),
-            "temperature": float(os.getenv("TEMPERATURE", "1.0"))
-        }
+        self._refresh_if_changed()
+        if self._claude_config is None:
+            self._claude_config = MappingProxyType({
+                "api_key": os.getenv("ANTHROPIC_API_KEY"),
+                "model": os.getenv("CLAUDE_MODEL", "claude-3-5-sonnet-20241022"),
+                "api_base": os.getenv("ANTHROPIC_API_BASE"),
+                "max_tokens": int(os.getenv("MAX_TOKENS", "4096")),
+                "temperature": float(os.getenv("TEMPERATURE", "1.0"))
+            })
+        return self._claude_config
 
     def get_config(self, provider: str = "claude") -> Dict[str, Any]:
         """
@@ -133,10 +173,7 @@ class ConfigLoader:
         }
 
 
-# 全局配置加载器实例
-_config_loader = None
-
-
+@functools.lru_cache(maxsize=1)
 def get_config_loader() -> ConfigLoader:
     """
     获取全局配置加载器实例(单例模式)
@@ -144,7 +181,4 @@ def get_config_loader() -> ConfigLoader:
     Returns:
         配置加载器实例
     """
-    global _config_loader
-    if _config_loader is None:
-        _config_loader = ConfigLoader()
-    return _config_loader
+    return ConfigLoader()
@@ -2,13 +2,77 @@
 Issue存储模块
 负责将issue持久化到文件系统,实现黑箱评审
 """
+import functools
 import json
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 from datetime import datetime
 
 from .models import Issue, IssueLevel, Phase
 
+# issue文件命名: {phase}_iter_{N}_issues.json
+_ITER_SUFFIX = "_issues.json"
+
+# 枚举value -> 成员直查表,逐issue反序列化时绕开Enum.__call__
+_LEVEL_BY_VALUE = {member.value: member for member in IssueLevel}
+
+# 级别value常量: 统计聚合里反复取IssueLevel.X.value是两级属性链,提前展开
+_CRITICAL = IssueLevel.CRITICAL.value
+_MAJOR = IssueLevel.MAJOR.value
+_MINOR = IssueLevel.MINOR.value
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """先写临时文件再os.replace,避免进程中断留下半截JSON"""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+# 超过该字节数的文件走mmap零拷贝解析,小文件mmap建立开销反而更贵
+_MMAP_THRESHOLD = 64 * 1024
+
+try:
+    # 可选依赖: orjson的Rust实现序列化快5-6倍,直接产出UTF-8字节
+    import mmap
+
+    import orjson
+
+    def _dump_json(path: Path, obj: Any) -> None:
+        """序列化对象并原子写入文件(orjson,紧凑输出)"""
+        _atomic_write(path, orjson.dumps(obj))
+
+    def _load_json(path: Path) -> Any:
+        """读取文件并反序列化(orjson,大文件mmap零拷贝)"""
+        if path.stat().st_size > _MMAP_THRESHOLD:
+            with open(path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    # orjson直接从页缓存映射的buffer解析,省去一次用户态拷贝
+                    return orjson.loads(memoryview(mapped))
+        return orjson.loads(path.read_bytes())
+
+    def _dumps_bytes(obj: Any) -> bytes:
+        """序列化为单行UTF-8字节(orjson)"""
+        return orjson.dumps(obj)
+except ImportError:
+    def _dump_json(path: Path, obj: Any) -> None:
+        """序列化对象并原子写入文件(stdlib回退,紧凑输出)"""
+        _atomic_write(
+            path,
+            json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+        )
+
+    def _load_json(path: Path) -> Any:
+        """读取文件并反序列化(stdlib回退)"""
+        return json.loads(path.read_bytes())
+
+    def _dumps_bytes(obj: Any) -> bytes:
+        """序列化为单行UTF-8字节(stdlib回退)"""
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
 
 class IssueStorage:
     """Issue文件存储管理器"""
@@ -23,10 +87,22 @@ class IssueStorage:
         self.project_dir = project_dir
         self.issues_dir = project_dir / "issues"
         self.blocked_issues_file = self.issues_dir / "blocked_issues.json"
-
+        # 阻塞issue的追加日志(JSON Lines): 新增只做append,避免整文件重写
+        self.blocked_log_file = self.issues_dir / "blocked_issues.ndjson"
+        # 阻塞issue总数的旁路文件: 查数量时免去整个JSON的解析
+        self.blocked_count_file = self.issues_dir / "blocked_issues.count"
         # 确保目录存在
         self.issues_dir.mkdir(parents=True, exist_ok=True)
 
+        # 阶段评审日志缓存: 路径 -> ((mtime_ns, size), 条目列表)
+        self._log_cache: Dict[Path, tuple] = {}
+        # 解析结果缓存: 路径 -> ((mtime_ns, size), issue列表)。
+        # get_statistics连续遍历三个阶段会反复碰到同一批文件,
+        # 文件未变化时直接复用解析结果,省掉重复的JSON解析和对象构造
+        self._parse_cache: Dict[Path, tuple] = {}
+        # 已知阻塞issue的(description, level)键集,懒加载用于追加去重
+        self._blocked_keys: Optional[set] = None
+
     def save_review_issues(
         self,
         phase: Phase,
@@ -41,19 +117,51 @@ class IssueStorage:
             iteration: 迭代次数
             issues: issue列表
         """
-        filename = f"{phase.value.lower()}_iter_{iteration}_issues.json"
-        filepath = self.issues_dir / filename
-
-        # 将Issue对象转换为字典
         issues_data = {
             "phase": phase.value,
             "iteration": iteration,
             "review_date": datetime.now().isoformat(),
+            # 写入时顺手按级别计数,统计路径无需再逐条扫描issue
+            "counts": dict(Counter(issue.level.value for issue in issues)),
             "issues": [self._issue_to_dict(issue) for issue in issues]
         }
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(issues_data, f, ensure_ascii=False, indent=2)
+        # 每阶段一个追加日志: 逐迭代建新文件改为单文件顺序append,
+        # 省去每次评审的目录项创建,页缓存层面写入也能合并
+        with open(self._phase_log_file(phase), 'ab') as f:
+            f.write(_dumps_bytes(issues_data) + b"\n")
+
+    def _phase_log_file(self, phase: Phase) -> Path:
+        """某阶段评审日志(JSON Lines)的路径"""
+        return self.issues_dir / f"{phase.value.lower()}.ndjson"
+
+    def _load_phase_log(self, phase: Phase) -> List[Dict[str, Any]]:
+        """
+        加载某阶段评审日志的全部条目,结果按(mtime_ns, size)缓存
+
+        Args:
+            phase: 评审阶段
+
+        Returns:
+            按追加顺序排列的评审条目列表
+        """
+        path = self._phase_log_file(phase)
+        if not path.exists():
+            return []
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._log_cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        entries = []
+        with open(path, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entries.append(json.loads(line))
+        self._log_cache[path] = (stamp, entries)
+        return entries
 
     def load_review_issues(
         self,
@@ -70,16 +178,17 @@ class IssueStorage:
         Returns:
             issue列表
         """
-        filename = f"{phase.value.lower()}_iter_{iteration}_issues.json"
-        filepath = self.issues_dir / filename
+        # 同一迭代可能被重评多次(回退后重跑),取最近追加的那条
+        for entry in reversed(self._load_phase_log(phase)):
+            if entry.get("iteration") == iteration:
+                return [self._dict_to_issue(d) for d in entry.get("issues", [])]
 
+        # 旧格式: 逐迭代独立文件
+        filepath = self.issues_dir / f"{phase.value.lower()}_iter_{iteration}_issues.json"
         if not filepath.exists():
             return []
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            issues_data = json.load(f)
-
-        return [self._dict_to_issue(issue_dict) for issue_dict in issues_data.get("issues", [])]
+        return self._load_issue_file(filepath)
 
     def save_blocked_issues(self, issues: List[Issue]) -> None:
         """
@@ -94,8 +203,15 @@ class IssueStorage:
             "issues": [self._issue_to_dict(issue) for issue in issues]
         }
 
-        with open(self.blocked_issues_file, 'w', encoding='utf-8') as f:
-            json.dump(blocked_data, f, ensure_ascii=False, indent=2)
+        _dump_json(self.blocked_issues_file, blocked_data)
+
+        # 整体重写即是一次合并,追加日志随之作废
+        if self.blocked_log_file.exists():
+            self.blocked_log_file.unlink()
+        self._blocked_keys = {
+            (issue.description, issue.level.value) for issue in issues
+        }
+        self.blocked_count_file.write_bytes(str(len(self._blocked_keys)).encode('ascii'))
 
     def load_blocked_issues(self) -> List[Issue]:
         """
@@ -104,13 +220,23 @@ class IssueStorage:
         Returns:
             阻塞issue列表
         """
-        if not self.blocked_issues_file.exists():
-            return []
+        return [self._dict_to_issue(issue_dict) for issue_dict in self._load_blocked_raw()]
 
-        with open(self.blocked_issues_file, 'r', encoding='utf-8') as f:
-            blocked_data = json.load(f)
+    def _load_blocked_raw(self) -> List[Dict[str, Any]]:
+        """
+        加载阻塞issue的原始字典列表(固化文件+追加日志)
 
-        return [self._dict_to_issue(issue_dict) for issue_dict in blocked_data.get("issues", [])]
+        去重键集、统计等只读字段的路径直接消费字典,
+        跳过Issue对象构造及其__post_init__时间戳调用。
+
+        Returns:
+            issue字典列表
+        """
+        raw = []
+        if self.blocked_issues_file.exists():
+            raw = list(_load_json(self.blocked_issues_file).get("issues", []))
+        raw.extend(self._iter_blocked_log())
+        return raw
 
     def get_blocked_issues_count(self) -> int:
         """
@@ -119,13 +245,18 @@ class IssueStorage:
         Returns:
             阻塞issue数量
         """
-        if not self.blocked_issues_file.exists():
-            return 0
-
-        with open(self.blocked_issues_file, 'r', encoding='utf-8') as f:
-            blocked_data = json.load(f)
-
-        return blocked_data.get("count", 0)
+        # 旁路计数文件: O(1)读取,每次写路径都会同步更新
+        if self.blocked_count_file.exists():
+            try:
+                return int(self.blocked_count_file.read_bytes())
+            except ValueError:
+                pass
+
+        # 旁路文件缺失/损坏(旧项目目录)时回退为解析统计
+        count = 0
+        if self.blocked_issues_file.exists():
+            count = _load_json(self.blocked_issues_file).get("count", 0)
+        return count + sum(1 for _ in self._iter_blocked_log())
 
     def add_blocked_issues(self, new_issues: List[Issue]) -> None:
         """
@@ -134,20 +265,53 @@ class IssueStorage:
         Args:
             new_issues: 新的阻塞issue列表
         """
-        # 加载现有的阻塞issue
-        existing_issues = self.load_blocked_issues()
-
-        # 合并(去重:基于description和level)
-        existing_keys = {(issue.description, issue.level.value) for issue in existing_issues}
+        # 只追加不重写: 去重靠内存键集,新条目append到JSON Lines日志,
+        # 把每批O(全量)的读-改-写降为O(新增)的顺序追加
+        existing_keys = self._load_blocked_keys()
 
+        lines = []
         for issue in new_issues:
             key = (issue.description, issue.level.value)
             if key not in existing_keys:
-                existing_issues.append(issue)
+                lines.append(_dumps_bytes(self._issue_to_dict(issue)) + b"\n")
                 existing_keys.add(key)
 
-        # 保存合并后的列表
-        self.save_blocked_issues(existing_issues)
+        if lines:
+            with open(self.blocked_log_file, 'ab') as f:
+                f.write(b"".join(lines))
+            self.blocked_count_file.write_bytes(str(len(existing_keys)).encode('ascii'))
+
+    def flush_blocked(self, max_log_bytes: int = 64 * 1024) -> None:
+        """
+        将追加日志固化回blocked_issues.json
+
+        Args:
+            max_log_bytes: 日志小于该字节数时跳过固化(0表示强制)
+        """
+        if not self.blocked_log_file.exists():
+            return
+        if max_log_bytes and self.blocked_log_file.stat().st_size < max_log_bytes:
+            return
+        self.save_blocked_issues(self.load_blocked_issues())
+
+    def _iter_blocked_log(self):
+        """逐行产出追加日志中的issue字典,日志缺失时为空"""
+        if not self.blocked_log_file.exists():
+            return
+        with open(self.blocked_log_file, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    def _load_blocked_keys(self) -> set:
+        """懒加载阻塞issue的去重键集(固化文件+追加日志)"""
+        if self._blocked_keys is None:
+            self._blocked_keys = {
+                (issue_dict["description"], issue_dict["level"])
+                for issue_dict in self._load_blocked_raw()
+            }
+        return self._blocked_keys
 
     def clear_blocked_issues(self) -> None:
         """清空所有阻塞issue"""
@@ -163,17 +327,24 @@ class IssueStorage:
         Returns:
             该阶段所有issue列表
         """
-        all_issues = []
-
-        # 遍历issues目录,找到所有该阶段的issue文件
-        pattern = f"{phase.value.lower()}_iter_*_issues.json"
-        for filepath in self.issues_dir.glob(pattern):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                issues_data = json.load(f)
-
-            issues = [self._dict_to_issue(issue_dict) for issue_dict in issues_data.get("issues", [])]
-            all_issues.extend(issues)
-
+        files = [filepath for _, filepath in self._scan_issue_files(phase)]
+
+        # 少量文件串行即可;文件多时用线程池重叠I/O与解析
+        # (orjson解码期间会释放GIL,解析也能真并行)
+        if len(files) < 4:
+            all_issues = []
+            for filepath in files:
+                all_issues.extend(self._load_issue_file(filepath))
+        else:
+            with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+                all_issues = list(
+                    chain.from_iterable(executor.map(self._load_issue_file, files))
+                )
+
+        for entry in self._load_phase_log(phase):
+            all_issues.extend(
+                self._dict_to_issue(d) for d in entry.get("issues", [])
+            )
         return all_issues
 
     def get_latest_issues_for_phase(self, phase: Phase) -> Optional[List[Issue]]:
@@ -186,26 +357,58 @@ class IssueStorage:
         Returns:
             最新的issue列表,如果没有则返回None
         """
-        # 找到所有该阶段的issue文件
-        pattern = f"{phase.value.lower()}_iter_*_issues.json"
-        files = list(self.issues_dir.glob(pattern))
-
-        if not files:
+        # 追加日志的最后一条即最近一次评审
+        entries = self._load_phase_log(phase)
+        if entries:
+            return [self._dict_to_issue(d) for d in entries[-1].get("issues", [])]
+
+        # 旧格式(旧项目目录)回退为目录扫描
+        latest = max(self._scan_issue_files(phase), default=None)
+        if latest is None:
             return None
 
-        # 找到最新的文件(根据iteration号)
-        latest_file = max(files, key=lambda f: self._extract_iteration(f.name))
+        return self._load_issue_file(latest[1])
 
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            issues_data = json.load(f)
+    def _load_issue_file(self, filepath: Path) -> List[Issue]:
+        """
+        解析单个issue文件,结果按(mtime_ns, size)缓存
 
-        return [self._dict_to_issue(issue_dict) for issue_dict in issues_data.get("issues", [])]
+        Args:
+            filepath: issue文件路径
 
-    def _extract_iteration(self, filename: str) -> int:
-        """从文件名提取迭代次数"""
-        import re
-        match = re.search(r'iter_(\d+)_', filename)
-        return int(match.group(1)) if match else 0
+        Returns:
+            issue列表(浅拷贝,调用方可自由增删)
+        """
+        stat = filepath.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._parse_cache.get(filepath)
+        if cached is not None and cached[0] == stamp:
+            return list(cached[1])
+
+        issues_data = _load_json(filepath)
+        issues = [self._dict_to_issue(issue_dict) for issue_dict in issues_data.get("issues", [])]
+        self._parse_cache[filepath] = (stamp, issues)
+        return list(issues)
+
+    def _scan_issue_files(self, phase: Phase):
+        """
+        扫描某阶段的所有issue文件
+
+        单趟os.scandir配合字符串切片取迭代号,比glob+正则逐文件
+        提取省去模式编译与多次目录遍历。
+
+        Yields:
+            (iteration, 文件路径)元组
+        """
+        prefix = f"{phase.value.lower()}_iter_"
+        for entry in os.scandir(self.issues_dir):
+            name = entry.name
+            if name.startswith(prefix) and name.endswith(_ITER_SUFFIX):
+                try:
+                    iteration = int(name[len(prefix):-len(_ITER_SUFFIX)])
+                except ValueError:
+                    continue
+                yield iteration, Path(entry.path)
 
     def _issue_to_dict(self, issue: Issue) -> Dict[str, Any]:
         """将Issue对象转换为字典"""
@@ -220,11 +423,13 @@ class IssueStorage:
     def _dict_to_issue(self, issue_dict: Dict[str, Any]) -> Issue:
         """将字典转换为Issue对象"""
         return Issue(
-            level=IssueLevel(issue_dict["level"]),
+            level=_LEVEL_BY_VALUE[issue_dict["level"]],
             description=issue_dict["description"],
             line_number=issue_dict.get("line_number"),
             file_path=issue_dict.get("file_path"),
-            created_at=issue_dict.get("created_at", datetime.now().isoformat())
+            # 缺失时传None交给__post_init__补默认值: 旧写法的get默认参数
+            # 每次调用都会执行datetime.now(),批量加载时是纯浪费
+            created_at=issue_dict.get("created_at")
         )
 
     def get_statistics(self) -> Dict[str, Any]:
@@ -239,14 +444,101 @@ class IssueStorage:
             "by_phase": {}
         }
 
-        # 统计各阶段的issue
+        # 统计各阶段的issue: 单趟Counter聚合level字符串,
+        # 未缓存的文件直接数原始字典,不构造Issue对象
+        for phase in Phase:
+            counts = Counter(self._iter_raw_levels(phase))
+            stats["by_phase"][phase.value] = {
+                "total": sum(counts.values()),
+                "critical": counts.get(_CRITICAL, 0),
+                "major": counts.get(_MAJOR, 0),
+                "minor": counts.get(_MINOR, 0)
+            }
+
+        return stats
+
+    def get_statistics_fast(self) -> Dict[str, Any]:
+        """
+        获取issue统计信息(优先消费写入时预计算的counts块)
+
+        与get_statistics结果一致;新格式文件只读counts字段求和,
+        旧格式文件回退为逐条数level。
+
+        Returns:
+            统计信息字典
+        """
+        stats = {
+            "total_blocked": self.get_blocked_issues_count(),
+            "by_phase": {}
+        }
+
         for phase in Phase:
-            issues = self.get_all_issues_for_phase(phase)
+            counts = Counter()
+            for _, filepath in self._scan_issue_files(phase):
+                issues_data = _load_json(filepath)
+                precomputed = issues_data.get("counts")
+                if precomputed is not None:
+                    counts.update(precomputed)
+                else:
+                    # 旧格式文件没有counts块
+                    counts.update(
+                        issue_dict["level"] for issue_dict in issues_data.get("issues", [])
+                    )
+            for entry in self._load_phase_log(phase):
+                precomputed = entry.get("counts")
+                if precomputed is not None:
+                    counts.update(precomputed)
+                else:
+                    counts.update(
+                        issue_dict["level"] for issue_dict in entry.get("issues", [])
+                    )
             stats["by_phase"][phase.value] = {
-                "total": len(issues),
-                "critical": len([i for i in issues if i.level == IssueLevel.CRITICAL]),
-                "major": len([i for i in issues if i.level == IssueLevel.MAJOR]),
-                "minor": len([i for i in issues if i.level == IssueLevel.MINOR])
+                "total": sum(counts.values()),
+                "critical": counts.get(_CRITICAL, 0),
+                "major": counts.get(_MAJOR, 0),
+                "minor": counts.get(_MINOR, 0)
             }
 
         return stats
+
+    def _iter_raw_levels(self, phase: Phase):
+        """
+        产出某阶段所有issue的level字符串
+
+        命中解析缓存时复用已构造的Issue,未命中时只读原始字典,
+        统计路径上完全跳过Issue对象构造。
+
+        Yields:
+            issue的level值(字符串)
+        """
+        for _, filepath in self._scan_issue_files(phase):
+            stat = filepath.stat()
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            cached = self._parse_cache.get(filepath)
+            if cached is not None and cached[0] == stamp:
+                for issue in cached[1]:
+                    yield issue.level.value
+            else:
+                for issue_dict in _load_json(filepath).get("issues", []):
+                    yield issue_dict["level"]
+
+        for entry in self._load_phase_log(phase):
+            for issue_dict in entry.get("issues", []):
+                yield issue_dict["level"]
+
+
+@functools.lru_cache(maxsize=16)
+def get_issue_storage(project_dir: Path) -> IssueStorage:
+    """
+    获取项目目录对应的IssueStorage实例(进程内共享)
+
+    同一项目的多个组件复用同一实例,解析缓存与去重键集随之共享,
+    避免各自冷启动时的重复解析。
+
+    Args:
+        project_dir: 项目根目录
+
+    Returns:
+        IssueStorage实例
+    """
+    return IssueStorage(project_dir)
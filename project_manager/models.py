@@ -3,10 +3,22 @@
 """
 from enum import Enum
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field
 import json
 from datetime import datetime
 
+try:
+    import orjson
+
+    def _dumps_bytes(obj: Any) -> bytes:
+        """序列化为紧凑JSON字节串"""
+        return orjson.dumps(obj)
+
+except ImportError:
+    def _dumps_bytes(obj: Any) -> bytes:
+        """序列化为紧凑JSON字节串(stdlib回退)"""
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
 
 class Phase(Enum):
     """项目阶段枚举（3阶段流程）"""
@@ -16,6 +28,16 @@ class Phase(Enum):
     # 注：测试代码应该在DEVELOPMENT阶段由AI生成，包括单元测试和集成测试代码
 
 
+# 阶段顺序与转换表: 预编译为静态查找,转换判断从线性扫描变为一次dict查找
+PHASE_ORDER = (Phase.BASIC_DESIGN, Phase.DETAIL_DESIGN, Phase.DEVELOPMENT)
+NEXT_PHASE = {
+    Phase.BASIC_DESIGN: Phase.DETAIL_DESIGN,
+    Phase.DETAIL_DESIGN: Phase.DEVELOPMENT,
+    # DEVELOPMENT是最后阶段,无后继
+}
+PHASE_INDEX = {phase: index for index, phase in enumerate(PHASE_ORDER)}
+
+
 class Mode(Enum):
     """系统模式枚举"""
     DEVELOPER = "developer"
@@ -29,7 +51,15 @@ class IssueLevel(Enum):
     MINOR = "MINOR"        # 建议改进
 
 
-@dataclass
+# 枚举value -> 成员直查表: 绕开Enum.__call__的校验开销,批量反序列化时可感
+_PHASE_BY_VALUE = {member.value: member for member in Phase}
+_MODE_BY_VALUE = {member.value: member for member in Mode}
+_LEVEL_BY_VALUE = {member.value: member for member in IssueLevel}
+
+
+# 数据类统一slots=True: Issue/ReviewResult按评审发现批量实例化,
+# 槽存储省去每实例__dict__,批量解析时内存与属性访问都更省
+@dataclass(slots=True)
 class Issue:
     """问题数据结构"""
     level: IssueLevel
@@ -53,7 +83,7 @@ class Issue:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ReviewResult:
     """评审结果数据结构"""
     score: float
@@ -63,25 +93,48 @@ class ReviewResult:
     review_date: str = None
     phase: str = None
     iteration: int = 0
-    
+    # 字典/字节串两级缓存: 评审历史只增不改,每次保存状态时无需重组旧条目;
+    # 万一字段被改写,__setattr__会把两级缓存一并失效
+    _dict_cache: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _json_cache: Optional[bytes] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def __post_init__(self):
         if self.review_date is None:
             self.review_date = datetime.now().isoformat()
-    
+
+    def __setattr__(self, name, value):
+        # 公开字段变更时失效缓存(下划线槽本身的赋值不触发)
+        if not name.startswith('_'):
+            object.__setattr__(self, '_dict_cache', None)
+            object.__setattr__(self, '_json_cache', None)
+        object.__setattr__(self, name, value)
+
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典格式"""
-        return {
-            'score': self.score,
-            'issues': [issue.to_dict() for issue in self.issues],
-            'improvements': self.improvements,
-            'checklist': self.checklist,
-            'review_date': self.review_date,
-            'phase': self.phase,
-            'iteration': self.iteration
-        }
+        """转换为字典格式(结果缓存,历史条目通常不再变更)"""
+        if self._dict_cache is None:
+            self._dict_cache = {
+                'score': self.score,
+                'issues': [issue.to_dict() for issue in self.issues],
+                'improvements': self.improvements,
+                'checklist': self.checklist,
+                'review_date': self.review_date,
+                'phase': self.phase,
+                'iteration': self.iteration
+            }
+        return self._dict_cache
+
+    def to_json_bytes(self) -> bytes:
+        """序列化为紧凑JSON字节串(结果缓存,供追加式日志直接写出)"""
+        if self._json_cache is None:
+            self._json_cache = _dumps_bytes(self.to_dict())
+        return self._json_cache
 
 
-@dataclass
+@dataclass(slots=True)
 class PhaseHistory:
     """阶段历史记录"""
     iterations: int = 0
@@ -98,7 +151,7 @@ class PhaseHistory:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class TechStack:
     """技术栈配置"""
     language: str
@@ -127,7 +180,7 @@ class TechStack:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DatabaseConfig:
     """数据库配置"""
     type: str
@@ -152,7 +205,7 @@ class DatabaseConfig:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DeploymentConfig:
     """部署配置"""
     platform: str = 'local'
@@ -177,7 +230,7 @@ class DeploymentConfig:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceConfig:
     """性能配置"""
     response_time: str = 'normal'  # normal, fast, ultra_fast
@@ -198,7 +251,7 @@ class PerformanceConfig:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ProjectRequirements:
     """项目要件配置"""
     project_info: Dict[str, Any]
@@ -225,7 +278,7 @@ class ProjectRequirements:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ProjectState:
     """项目状态数据结构 (不包含issue - issue存储在文件中)"""
     project_name: str
@@ -253,66 +306,90 @@ class ProjectState:
     
     def __post_init__(self):
         if self.updated_at is None:
-            self.updated_at = datetime.now().isoformat()
+            self.updated_at = datetime.now().isoformat(timespec='seconds')
         
         # 初始化阶段历史
         if not self.phase_history:
             for phase in Phase:
                 self.phase_history[phase.value] = PhaseHistory()
     
-    def to_dict(self) -> Dict[str, Any]:
-        """转换为字典格式 (不包含blocked_issues - 存储在文件中)"""
-        data = asdict(self)
-        data['current_phase'] = self.current_phase.value
-        data['current_mode'] = self.current_mode.value
-        data['phase_scores'] = self.phase_scores
-        # blocked_issues 已移除 - 从 IssueStorage 读取
-        data['review_history'] = [result.to_dict() for result in self.review_history]
-        data['phase_history'] = {k: v.to_dict() for k, v in self.phase_history.items()}
-        data['quality_gates'] = self.quality_gates
-        return data
+    def to_dict(self, include_history: bool = True) -> Dict[str, Any]:
+        """
+        转换为字典格式 (不包含blocked_issues - 存储在文件中)
+
+        Args:
+            include_history: 是否内联评审历史;历史另存sidecar日志时传False
+        """
+        # 显式构建字典: asdict会递归深拷贝所有嵌套字段,
+        # 其中大半随即被覆盖,状态越大浪费越多
+        return {
+            'project_name': self.project_name,
+            'current_phase': self.current_phase.value,
+            'phase_iteration': self.phase_iteration,
+            'current_mode': self.current_mode.value,
+            'status': self.status,
+            'phase_scores': self.phase_scores,
+            # blocked_issues 已移除 - 从 IssueStorage 读取
+            'improvements': self.improvements,
+            'review_history': (
+                [result.to_dict() for result in self.review_history]
+                if include_history else []
+            ),
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'from_rollback': self.from_rollback,
+            'rollback_reason': self.rollback_reason,
+            'rollback_count': self.rollback_count,
+            'phase_history': {k: v.to_dict() for k, v in self.phase_history.items()},
+            'quality_gates': self.quality_gates,
+            'requirements': self.requirements
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ProjectState':
         """从字典创建实例 (兼容旧数据,忽略blocked_issues字段)"""
         # 转换枚举类型
-        data['current_phase'] = Phase(data['current_phase'])
-        data['current_mode'] = Mode(data['current_mode'])
+        data['current_phase'] = _PHASE_BY_VALUE[data['current_phase']]
+        data['current_mode'] = _MODE_BY_VALUE[data['current_mode']]
 
         # 移除 blocked_issues 字段(如果存在,用于兼容旧数据)
         data.pop('blocked_issues', None)
         
-        # 转换评审历史
+        # 转换评审历史: 局部绑定类与查表方法,按声明顺序位置传参,
+        # 省去每次会话重载时循环内的全局查找与关键字参数开销
+        _issue_cls = Issue
+        _review_cls = ReviewResult
+        _get_level = _LEVEL_BY_VALUE.__getitem__
         data['review_history'] = [
-            ReviewResult(
-                score=result['score'],
-                issues=[
-                    Issue(
-                        level=IssueLevel(issue['level']),
-                        description=issue['description'],
-                        line_number=issue.get('line_number'),
-                        file_path=issue.get('file_path'),
-                        created_at=issue.get('created_at')
-                    ) for issue in result.get('issues', [])
+            _review_cls(
+                result['score'],
+                [
+                    _issue_cls(
+                        _get_level(issue['level']),
+                        issue['description'],
+                        issue.get('line_number'),
+                        issue.get('file_path'),
+                        issue.get('created_at')
+                    ) for issue in result.get('issues', ())
                 ],
-                improvements=result.get('improvements', []),
-                checklist=result.get('checklist', {}),
-                review_date=result.get('review_date'),
-                phase=result.get('phase'),
-                iteration=result.get('iteration', 0)
-            ) for result in data.get('review_history', [])
+                result.get('improvements', []),
+                result.get('checklist', {}),
+                result.get('review_date'),
+                result.get('phase'),
+                result.get('iteration', 0)
+            ) for result in data.get('review_history', ())
         ]
-        
+
         # 转换阶段历史
-        phase_history = {}
-        for phase_name, history_data in data.get('phase_history', {}).items():
-            phase_history[phase_name] = PhaseHistory(
-                iterations=history_data.get('iterations', 0),
-                scores=history_data.get('scores', []),
-                issues_fixed=history_data.get('issues_fixed', []),
-                rollback_count=history_data.get('rollback_count', 0)
+        data['phase_history'] = {
+            phase_name: PhaseHistory(
+                history_data.get('iterations', 0),
+                history_data.get('scores', []),
+                history_data.get('issues_fixed', []),
+                history_data.get('rollback_count', 0)
             )
-        data['phase_history'] = phase_history
+            for phase_name, history_data in data.get('phase_history', {}).items()
+        }
         
         # 确保quality_gates存在
         if 'quality_gates' not in data:
@@ -328,66 +405,85 @@ class ProjectState:
 
 class PhaseConfig:
     """阶段配置类"""
-    
-    @staticmethod
-    def get_basic_design_checklist() -> Dict[str, float]:
-        """获取基本设计阶段检查项"""
-        return {
+
+    # 配置表在类体求值一次,各get_*退化为查表,
+    # 不再每次调用重建字典/列表字面量
+    _CHECKLISTS = {
+        Phase.BASIC_DESIGN: {
             "业务完整性": 30.0,
             "数据库设计": 25.0,
             "架构合理性": 25.0,
             "接口定义": 20.0
-        }
-    
-    @staticmethod
-    def get_detail_design_checklist() -> Dict[str, float]:
-        """获取详细设计阶段检查项"""
-        return {
+        },
+        Phase.DETAIL_DESIGN: {
             "类设计": 30.0,
             "数据结构": 25.0,
             "算法合理性": 25.0,
             "模块耦合": 20.0
-        }
-    
-    @staticmethod
-    def get_development_checklist() -> Dict[str, float]:
-        """获取开发实现阶段检查项"""
-        return {
+        },
+        Phase.DEVELOPMENT: {
             "功能完整性": 35.0,
             "代码规范": 25.0,
             "异常处理": 20.0,
             "性能": 20.0
         }
+    }
+    _MAX_ITERATIONS = {
+        Phase.BASIC_DESIGN: 5,
+        Phase.DETAIL_DESIGN: 4,
+        Phase.DEVELOPMENT: 4
+    }
+    _PASS_THRESHOLDS = {
+        Phase.BASIC_DESIGN: 80.0,
+        Phase.DETAIL_DESIGN: 80.0,
+        Phase.DEVELOPMENT: 85.0
+    }
+    _ROLLBACK_RULES = {
+        Phase.DETAIL_DESIGN: (Phase.BASIC_DESIGN,),
+        Phase.DEVELOPMENT: (Phase.DETAIL_DESIGN,)
+    }
+    _ROLLBACK_CONDITIONS = {
+        Phase.DETAIL_DESIGN: (
+            "数据库设计无法支持",
+            "架构存在根本缺陷"
+        ),
+        Phase.DEVELOPMENT: (
+            "数据结构无法实现",
+            "算法逻辑漏洞"
+        )
+    }
+
+    @staticmethod
+    def get_basic_design_checklist() -> Dict[str, float]:
+        """获取基本设计阶段检查项"""
+        return dict(PhaseConfig._CHECKLISTS[Phase.BASIC_DESIGN])
+    
+    @staticmethod
+    def get_detail_design_checklist() -> Dict[str, float]:
+        """获取详细设计阶段检查项"""
+        return dict(PhaseConfig._CHECKLISTS[Phase.DETAIL_DESIGN])
+    
+    @staticmethod
+    def get_development_checklist() -> Dict[str, float]:
+        """获取开发实现阶段检查项"""
+        return dict(PhaseConfig._CHECKLISTS[Phase.DEVELOPMENT])
     
     @staticmethod
     def get_checklist_for_phase(phase: Phase) -> Dict[str, float]:
         """获取指定阶段的检查项（仅核心开发阶段）"""
-        checklists = {
-            Phase.BASIC_DESIGN: PhaseConfig.get_basic_design_checklist(),
-            Phase.DETAIL_DESIGN: PhaseConfig.get_detail_design_checklist(),
-            Phase.DEVELOPMENT: PhaseConfig.get_development_checklist()
-        }
-        return checklists.get(phase, {})
+        checklist = PhaseConfig._CHECKLISTS.get(phase)
+        # 返回副本,调用方可随意改动而不污染配置表
+        return dict(checklist) if checklist else {}
     
     @staticmethod
     def get_max_iterations(phase: Phase) -> int:
         """获取阶段最大迭代次数（仅核心开发阶段）"""
-        max_iterations = {
-            Phase.BASIC_DESIGN: 5,
-            Phase.DETAIL_DESIGN: 4,
-            Phase.DEVELOPMENT: 4
-        }
-        return max_iterations.get(phase, 3)
+        return PhaseConfig._MAX_ITERATIONS.get(phase, 3)
 
     @staticmethod
     def get_pass_threshold(phase: Phase) -> float:
         """获取阶段通过阈值（仅核心开发阶段）"""
-        thresholds = {
-            Phase.BASIC_DESIGN: 80.0,
-            Phase.DETAIL_DESIGN: 80.0,
-            Phase.DEVELOPMENT: 85.0
-        }
-        return thresholds.get(phase, 80.0)
+        return PhaseConfig._PASS_THRESHOLDS.get(phase, 80.0)
     
     @staticmethod
     def get_phase_output_format(phase: Phase) -> str:
@@ -425,23 +521,9 @@ class PhaseConfig:
     @staticmethod
     def can_rollback_to(phase: Phase) -> List[Phase]:
         """获取可以回退到的阶段（仅核心开发阶段）"""
-        rollback_rules = {
-            Phase.DETAIL_DESIGN: [Phase.BASIC_DESIGN],
-            Phase.DEVELOPMENT: [Phase.DETAIL_DESIGN]
-        }
-        return rollback_rules.get(phase, [])
+        return list(PhaseConfig._ROLLBACK_RULES.get(phase, ()))
     
     @staticmethod
     def get_rollback_conditions(phase: Phase) -> List[str]:
         """获取回退触发条件（仅核心开发阶段）"""
-        conditions = {
-            Phase.DETAIL_DESIGN: [
-                "数据库设计无法支持",
-                "架构存在根本缺陷"
-            ],
-            Phase.DEVELOPMENT: [
-                "数据结构无法实现",
-                "算法逻辑漏洞"
-            ]
-        }
-        return conditions.get(phase, [])
+        return list(PhaseConfig._ROLLBACK_CONDITIONS.get(phase, ()))
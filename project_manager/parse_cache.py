@@ -0,0 +1,50 @@
+"""
+解析结果磁盘缓存
+按内容哈希把YAML/markdown提示词的解析结果缓存为pickle文件,
+跨CLI进程复用: pickle反序列化远快于重新走YAML解析或正则分段
+"""
+import hashlib
+import pickle
+from pathlib import Path
+from typing import Any, Callable
+
+# 缓存目录: 按内容哈希命名,文件内容变化自然指向新的缓存条目
+_CACHE_DIR = Path('~/.cache/process-mng/parsed').expanduser()
+
+
+def cached_parse(path: Path, parser: Callable[[str], Any]) -> Any:
+    """
+    读取并解析文件,解析结果按内容哈希缓存到磁盘
+
+    缓存键是文件内容的blake2b哈希: 同一内容在任何进程中都命中,
+    内容变化后旧条目自然失效。缓存读写失败时静默回退为直接解析,
+    不影响功能正确性。
+
+    Args:
+        path: 待解析的文件路径
+        parser: 接收文件文本、返回解析结果的函数
+
+    Returns:
+        解析结果(可能来自磁盘缓存)
+    """
+    data = path.read_bytes()
+    key = hashlib.blake2b(data, digest_size=8).hexdigest()
+    cache_path = _CACHE_DIR / f"{key}.pkl"
+
+    try:
+        return pickle.loads(cache_path.read_bytes())
+    except (OSError, pickle.PickleError, EOFError):
+        pass
+
+    result = parser(data.decode('utf-8'))
+
+    try:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # 先写临时文件再原子替换,避免并发进程读到半截pickle
+        tmp_path = cache_path.with_suffix('.tmp')
+        tmp_path.write_bytes(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        tmp_path.replace(cache_path)
+    except OSError:
+        pass
+
+    return result
@@ -2,22 +2,346 @@
 项目管理器主模块
 负责项目状态管理、模式切换、阶段执行等核心功能
 """
+import copy
 import json
 import os
-from typing import Dict, List, Optional, Any
+from contextlib import contextmanager
+from string import Template
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from pathlib import Path
 
+try:
+    # 可选依赖: orjson为C实现,嵌套dict序列化快3-10倍;缺失时回退stdlib json
+    import orjson
+except ImportError:
+    orjson = None
+
 from .models import (
     ProjectState, Phase, Mode, IssueLevel, Issue, ReviewResult,
-    PhaseConfig
+    PhaseConfig, NEXT_PHASE
 )
 from .review_engine import ReviewEngine
 from .requirements_engine import RequirementsEngine
-from .issue_storage import IssueStorage
+from .issue_storage import get_issue_storage
 from .ai_integration import AIIntegration
 
 
+def _dump_state_bytes(data: Dict[str, Any]) -> bytes:
+    """序列化状态字典为UTF-8字节(优先orjson)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """先写临时文件再os.replace,进程中断不会留下半截状态文件"""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _load_state_bytes(raw: bytes) -> Dict[str, Any]:
+    """从UTF-8字节反序列化状态字典(优先orjson)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# 静态文档模板在导入时求值一次;生成方法只做两个占位符替换,
+# 不再每次调用重新求值整段多KB的f-string
+_BASIC_DESIGN_TMPL = Template("""# $name 基本设计文档 (第$it次迭代)
+
+## 1. 项目概述
+本项目是一个AI驱动的项目开发流程管理系统，支持双模式管理。
+
+## 2. 系统架构
+### 2.1 整体架构
+- 项目管理器 (ProjectManager)
+- 评审引擎 (ReviewEngine)
+- 状态管理 (ProjectState)
+
+### 2.2 核心模块
+- **项目管理器**：负责项目状态管理和流程控制
+- **评审引擎**：负责代码评审和评分
+- **数据模型**：定义项目状态和数据结构
+
+## 3. 接口设计
+### 3.1 ProjectManager接口
+- `set_mode(mode)`: 设置开发/评审模式
+- `execute_phase()`: 执行当前阶段任务
+- `review_phase()`: 评审当前阶段成果
+- `check_phase_transition()`: 检查阶段转换条件
+
+### 3.2 ReviewEngine接口
+- `evaluate(phase, content)`: 评估内容
+- `get_critical_issues()`: 获取关键问题
+- `get_next_improvement()`: 获取改进建议
+
+## 4. 数据结构
+### 4.1 项目状态
+```json
+{
+    "project_name": "项目名称",
+    "current_phase": "当前阶段",
+    "phase_iteration": "迭代次数",
+    "status": "项目状态"
+}
+```
+
+## 5. 异常处理
+- 文件读写异常处理
+- 状态转换异常处理
+- 评审过程异常处理
+
+## 6. 扩展性设计
+- 支持自定义评审规则
+- 支持多种输出格式
+- 支持插件化扩展
+""")
+
+_CODE_IMPL_TMPL = Template("""# $name 代码实现 (第$it次迭代)
+
+import copy
+import json
+import os
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any
+from datetime import datetime
+from pathlib import Path
+
+class ProjectManager:
+    \"\"\"项目管理器主类\"\"\"
+    
+    def __init__(self, project_name: str):
+        self.project_name = project_name
+        self.project_dir = Path(f"project_manager/{project_name}")
+        self.state_file = self.project_dir / "project_state.json"
+        self.review_engine = ReviewEngine()
+        self.state = self._load_or_create_state()
+    
+    def set_mode(self, mode: str) -> None:
+        \"\"\"设置当前模式\"\"\"
+        if mode not in ["developer", "reviewer"]:
+            raise ValueError("模式必须是 'developer' 或 'reviewer'")
+        self.state.current_mode = Mode(mode)
+        self._save_state()
+    
+    def execute_phase(self) -> str:
+        \"\"\"执行当前阶段任务\"\"\"
+        if self.state.current_mode == Mode.DEVELOPER:
+            return self._execute_developer_phase()
+        else:
+            return "当前为评审模式，无法执行开发任务"
+    
+    def review_phase(self) -> Dict[str, Any]:
+        \"\"\"评审当前阶段成果\"\"\"
+        if self.state.current_mode != Mode.REVIEWER:
+            raise ValueError("当前不是评审模式")
+        
+        content = self._read_phase_output()
+        review_result = self.review_engine.evaluate(
+            self.state.current_phase, 
+            content
+        )
+        
+        # 更新项目状态
+        self.state.phase_scores.append(review_result['score'])
+        self._save_state()
+        
+        return review_result
+    
+    def _save_state(self) -> None:
+        \"\"\"保存项目状态\"\"\"
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state.to_dict(), f, ensure_ascii=False, indent=2)
+
+class ReviewEngine:
+    \"\"\"评审引擎类\"\"\"
+    
+    def __init__(self):
+        self.current_issues = []
+        self.current_improvements = []
+    
+    def evaluate(self, phase: Phase, content: str) -> Dict[str, Any]:
+        \"\"\"评估指定阶段的内容\"\"\"
+        checklist = self._get_checklist_for_phase(phase)
+        scores = self._evaluate_content(phase, content, checklist)
+        total_score = self.calculate_score(scores)
+        
+        return {
+            'score': total_score,
+            'issues': [asdict(issue) for issue in self.current_issues],
+            'improvements': self.current_improvements,
+            'checklist': scores
+        }
+    
+    def calculate_score(self, checklist: Dict[str, float]) -> float:
+        \"\"\"计算总分\"\"\"
+        total_score = 0.0
+        for item, score in checklist.items():
+            total_score += score
+        return round(total_score, 2)
+    
+    def get_next_improvement(self) -> str:
+        \"\"\"获取最重要的改进建议\"\"\"
+        if not self.current_improvements:
+            return "当前阶段工作质量良好，无需改进"
+        
+        critical_issues = self.get_critical_issues()
+        if critical_issues:
+            return f"Critical问题：{critical_issues[0].description}"
+        
+        return self.current_improvements[0]
+
+# 错误处理示例
+try:
+    manager = ProjectManager("test_project")
+    manager.set_mode("developer")
+    result = manager.execute_phase()
+    print(result)
+except Exception as e:
+    print(f"错误：{e}")
+    # 记录错误日志
+    with open("error.log", "a") as f:
+        f.write(f"{datetime.now()}: {e}\\n")
+""")
+
+_DETAIL_DESIGN_TMPL = Template("""# $name 详细设计文档 (第$it次迭代)
+
+## 1. 代码架构
+### 1.1 类图设计
+```mermaid
+classDiagram
+    class ProjectManager {{
+        +project_name: str
+        +state: ProjectState
+        +review_engine: ReviewEngine
+        +set_mode(mode)
+        +execute_phase()
+        +review_phase()
+    }}
+    
+    class ReviewEngine {{
+        +current_issues: List[Issue]
+        +current_improvements: List[str]
+        +evaluate(phase, content)
+        +get_critical_issues()
+        +get_next_improvement()
+    }}
+    
+    class ProjectState {{
+        +project_name: str
+        +current_phase: Phase
+        +phase_iteration: int
+        +current_mode: Mode
+        +status: str
+        +to_dict()
+        +from_dict()
+    }}
+    
+    ProjectManager --> ProjectState
+    ProjectManager --> ReviewEngine
+```
+
+## 2. 核心算法
+### 2.1 评审算法伪代码
+```
+function evaluate(phase, content):
+    checklist = get_checklist_for_phase(phase)
+    scores = {}
+    
+    for item in checklist:
+        score = evaluate_item(content, item)
+        scores[item] = score
+        
+        if score < threshold:
+            add_issue(level, description)
+    
+    total_score = calculate_total_score(scores)
+    return {score: total_score, issues: issues, improvements: improvements}
+```
+
+## 3. 数据结构定义
+### 3.1 核心数据结构
+```python
+@dataclass
+class Issue:
+    level: IssueLevel
+    description: str
+    line_number: Optional[int]
+    file_path: Optional[str]
+    created_at: str
+
+@dataclass
+class ReviewResult:
+    score: float
+    issues: List[Issue]
+    improvements: List[str]
+    checklist: Dict[str, float]
+    review_date: str
+
+@dataclass
+class ProjectState:
+    project_name: str
+    current_phase: Phase
+    phase_iteration: int
+    current_mode: Mode
+    status: str
+    phase_scores: List[float]
+    blocked_issues: List[Issue]
+    improvements: List[str]
+    review_history: List[ReviewResult]
+    created_at: str
+    updated_at: str
+    from_rollback: bool
+    rollback_count: int
+    phase_history: Dict[str, PhaseHistory]
+```
+
+## 4. 关键流程时序图
+### 4.1 评审流程
+```mermaid
+sequenceDiagram
+    participant U as User
+    participant PM as ProjectManager
+    participant RE as ReviewEngine
+    participant FS as FileSystem
+    
+    U->>PM: set_mode("reviewer")
+    PM->>FS: read_phase_output()
+    FS-->>PM: content
+    PM->>RE: evaluate(phase, content)
+    RE-->>PM: review_result
+    PM->>FS: save_state()
+    PM-->>U: review_result
+```
+
+## 5. 异常处理策略
+### 5.1 异常分类
+- **文件异常**: 文件不存在、权限不足、格式错误
+- **状态异常**: 状态转换失败、数据不一致
+- **评审异常**: 内容解析失败、评分计算错误
+
+### 5.2 处理策略
+```python
+try:
+    # 执行操作
+    result = operation()
+except FileNotFoundError:
+    # 创建默认文件
+    create_default_file()
+except PermissionError:
+    # 提示用户权限问题
+    show_permission_error()
+except Exception as e:
+    # 记录错误日志
+    log_error(e)
+    # 返回错误信息
+    return error_response(e)
+```
+""")
+
 class ProjectManager:
     """项目管理器主类"""
     
@@ -31,6 +355,8 @@ class ProjectManager:
         self.project_name = project_name
         self.project_dir = Path(f"project_manager/{project_name}")
         self.state_file = self.project_dir / "project_state.json"
+        # 评审历史sidecar日志: 只追加,旧条目不随每次保存重写
+        self.history_log_file = self.project_dir / "review_history.jsonl"
         self.review_history_file = self.project_dir / "review_history.md"
         self.phase_outputs_dir = self.project_dir / "phase_outputs"
         
@@ -44,14 +370,31 @@ class ProjectManager:
         self.requirements_engine = RequirementsEngine()
 
         # 初始化Issue存储管理器
-        self.issue_storage = IssueStorage(self.project_dir)
+        self.issue_storage = get_issue_storage(self.project_dir)
 
         # 初始化AI集成
         self.ai_integration = AIIntegration(project_name=project_name)
 
         # 加载或创建项目状态
+        # (_history_synced = 已落入sidecar日志的历史条目数,由加载过程设置)
+        self._history_synced = 0
         self.state = self._load_or_create_state()
-    
+
+        # 状态字典缓存: 状态变更(_save_state)时失效
+        self._status_cache: Optional[Dict[str, Any]] = None
+
+        # 写合并: _txn()内的多次_save_state只置脏标记,退出时落盘一次
+        self._dirty = False
+        self._in_txn = 0
+        # 事务内待写的输出文件(path, data),退出时一批连续写出
+        self._pending_writes: List[tuple] = []
+        # 事务入口处取的时间戳,事务内的_now()统一复用
+        self._txn_now: Optional[str] = None
+        # 上次评审的(文件, mtime_ns, size, 阶段, 迭代)指纹及结果:
+        # 产物未变时重复评审直接返回缓存,不再重跑评审流水线
+        self._last_review_key: Optional[tuple] = None
+        self._last_review_result: Optional[Dict[str, Any]] = None
+
     def set_mode(self, mode: str) -> None:
         """
         设置当前模式
@@ -63,18 +406,21 @@ class ProjectManager:
             raise ValueError("模式必须是 'developer' 或 'reviewer'")
         
         self.state.current_mode = Mode(mode)
-        self.state.updated_at = datetime.now().isoformat()
+        self.state.updated_at = self._now()
         self._save_state()
     
-    def execute_phase(self) -> str:
+    def execute_phase(self, on_delta=None) -> str:
         """
         执行当前阶段任务
-        
+
+        Args:
+            on_delta: 可选的流式输出回调,逐段接收AI生成的文本增量
+
         Returns:
             生成的内容或状态信息
         """
         if self.state.current_mode == Mode.DEVELOPER:
-            return self._execute_developer_phase()
+            return self._execute_developer_phase(on_delta=on_delta)
         else:
             return "当前为评审模式，无法执行开发任务"
     
@@ -88,6 +434,22 @@ class ProjectManager:
         if self.state.current_mode != Mode.REVIEWER:
             raise ValueError("当前不是评审模式")
 
+        with self._txn():
+            return self._review_phase_locked()
+
+    def _review_phase_locked(self) -> Dict[str, Any]:
+        """review_phase的事务内实现"""
+        # 产物文件未变时短路: 同一份内容重复评审必然得到同一结果,
+        # 且无需再追加重复的历史/issue记录
+        output_file = self._locate_phase_output()
+        review_key = None
+        if output_file is not None:
+            st = output_file.stat()
+            review_key = (str(output_file), st.st_mtime_ns, st.st_size,
+                          self.state.current_phase, self.state.phase_iteration)
+            if review_key == self._last_review_key:
+                return copy.deepcopy(self._last_review_result)
+
         # 读取当前阶段的输出文件
         content = self._read_phase_output()
 
@@ -97,8 +459,14 @@ class ProjectManager:
             content
         )
 
-        # 将issue对象转换
-        issues = [Issue(**issue) for issue in review_result['issues']]
+        # 将issue对象转换,同一趟顺手挑出Critical,免得再扫一遍
+        issues = []
+        critical_issues = []
+        for issue_dict in review_result['issues']:
+            issue = Issue(**issue_dict)
+            issues.append(issue)
+            if issue.level is IssueLevel.CRITICAL:
+                critical_issues.append(issue)
 
         # 保存本次评审的issue到文件
         self.issue_storage.save_review_issues(
@@ -108,7 +476,6 @@ class ProjectManager:
         )
 
         # 更新阻塞issue文件
-        critical_issues = [issue for issue in issues if issue.level == IssueLevel.CRITICAL]
         if critical_issues:
             self.issue_storage.add_blocked_issues(critical_issues)
 
@@ -123,7 +490,7 @@ class ProjectManager:
 
         # 更新项目状态
         self.state.phase_scores.append(review_result['score'])
-        self.state.updated_at = datetime.now().isoformat()
+        self.state.updated_at = self._now()
 
         # 添加评审历史 (不包含issue,从文件读取)
         review_result_obj = ReviewResult(
@@ -149,6 +516,10 @@ class ProjectManager:
         # 将规整化报告添加到返回结果中
         review_result['formatted_report'] = formatted_report
 
+        # 记录本次评审指纹,内容不变的重复评审直接命中
+        self._last_review_key = review_key
+        self._last_review_result = copy.deepcopy(review_result)
+
         return review_result
     
     def check_phase_transition(self) -> bool:
@@ -177,20 +548,19 @@ class ProjectManager:
     
     def force_next_phase(self) -> None:
         """强制进入下一阶段"""
-        phase_order = [Phase.BASIC_DESIGN, Phase.DETAIL_DESIGN, Phase.DEVELOPMENT]
-        current_index = phase_order.index(self.state.current_phase)
-        
-        if current_index < len(phase_order) - 1:
-            self.state.current_phase = phase_order[current_index + 1]
+        next_phase = NEXT_PHASE.get(self.state.current_phase)
+
+        if next_phase is not None:
+            self.state.current_phase = next_phase
             self.state.phase_iteration = 0
             self.state.status = "IN_PROGRESS"
-            self.state.updated_at = datetime.now().isoformat()
+            self.state.updated_at = self._now()
             self._save_state()
             
             print(f"⚠️  警告：强制进入下一阶段 {self.state.current_phase.value}")
         else:
             self.state.status = "COMPLETED"
-            self.state.updated_at = datetime.now().isoformat()
+            self.state.updated_at = self._now()
             self._save_state()
             print("🎉 项目已完成所有阶段")
     
@@ -198,7 +568,7 @@ class ProjectManager:
         """进入下一次迭代"""
         self.state.phase_iteration += 1
         self.state.status = "IN_PROGRESS"
-        self.state.updated_at = datetime.now().isoformat()
+        self.state.updated_at = self._now()
         self._save_state()
     
     def rollback_to_phase(self, target_phase: Phase, reason: str = "") -> None:
@@ -209,19 +579,20 @@ class ProjectManager:
             raise ValueError(f"无法从 {self.state.current_phase.value} 回退到 {target_phase.value}")
         
         # 更新状态
-        self.state.current_phase = target_phase
-        self.state.phase_iteration = 0
-        self.state.status = "IN_PROGRESS"
-        self.state.from_rollback = True
-        self.state.rollback_reason = reason
-        self.state.rollback_count += 1
-        self.state.quality_gates["total_rollbacks"] += 1
-        self.state.updated_at = datetime.now().isoformat()
-        
-        # 更新阶段历史
-        self.state.phase_history[target_phase.value].rollback_count += 1
-        
-        self._save_state()
+        with self._txn():
+            self.state.current_phase = target_phase
+            self.state.phase_iteration = 0
+            self.state.status = "IN_PROGRESS"
+            self.state.from_rollback = True
+            self.state.rollback_reason = reason
+            self.state.rollback_count += 1
+            self.state.quality_gates["total_rollbacks"] += 1
+            self.state.updated_at = self._now()
+
+            # 更新阶段历史
+            self.state.phase_history[target_phase.value].rollback_count += 1
+
+            self._save_state()
         print(f"⚠️  回退到阶段：{target_phase.value}，原因：{reason}")
     
     def check_rollback_needed(self) -> Optional[Phase]:
@@ -231,28 +602,36 @@ class ProjectManager:
         
         latest_review = self.state.review_history[-1]
         
-        # 检查Critical问题
-        critical_issues = [issue for issue in latest_review.issues if issue.level == IssueLevel.CRITICAL]
-        if critical_issues:
-            # 获取回退触发条件
-            rollback_conditions = PhaseConfig.get_rollback_conditions(self.state.current_phase)
-            
-            # 检查是否匹配回退条件
-            for issue in critical_issues:
-                for condition in rollback_conditions:
-                    if condition.lower() in issue.description.lower():
-                        return self.review_engine.should_rollback(self.state.current_phase, latest_review.issues)
-        
+        # 检查Critical问题: 单趟遍历,触发条件只做一次lower()
+        conditions = None
+        for issue in latest_review.issues:
+            if issue.level is not IssueLevel.CRITICAL:
+                continue
+            if conditions is None:
+                conditions = [
+                    condition.lower()
+                    for condition in PhaseConfig.get_rollback_conditions(self.state.current_phase)
+                ]
+            description = issue.description.lower()
+            if any(condition in description for condition in conditions):
+                return self.review_engine.should_rollback(self.state.current_phase, latest_review.issues)
+
         return None
     
     def get_current_status(self) -> Dict[str, Any]:
         """
         获取当前项目状态 (从文件读取issue信息)
 
+        状态未变更时(自上次_save_state以来)直接返回缓存的字典,
+        避免工作流循环中每次迭代多次重复组装/读取。
+
         Returns:
             项目状态字典
         """
-        return {
+        if self._status_cache is not None:
+            return self._status_cache
+
+        self._status_cache = {
             'project_name': self.state.project_name,
             'current_phase': self.state.current_phase.value,
             'phase_iteration': self.state.phase_iteration,
@@ -265,10 +644,12 @@ class ProjectManager:
             'from_rollback': self.state.from_rollback,
             'rollback_reason': self.state.rollback_reason,
             'rollback_count': self.state.rollback_count,
-            'quality_gates': self.state.quality_gates,
+            # 快照而非引用: 缓存的状态字典不暴露可变的内部配置
+            'quality_gates': dict(self.state.quality_gates),
             'created_at': self.state.created_at,
             'updated_at': self.state.updated_at
         }
+        return self._status_cache
 
     def get_blocked_issues(self) -> List[Issue]:
         """
@@ -299,11 +680,9 @@ class ProjectManager:
         # 生成配置文件
         config_files = self.requirements_engine.generate_config_files(requirements, self.project_name)
         
-        # 更新项目状态
-        if not hasattr(self.state, 'requirements'):
-            self.state.requirements = {}
+        # 更新项目状态 (requirements是ProjectState的缺省字段,无需探测)
         self.state.requirements.update(requirements)
-        self.state.updated_at = datetime.now().isoformat()
+        self.state.updated_at = self._now()
         self._save_state()
         
         return {
@@ -318,7 +697,7 @@ class ProjectManager:
         Returns:
             要件配置字典
         """
-        return getattr(self.state, 'requirements', {})
+        return self.state.requirements
     
     def update_requirements(self, natural_language: str) -> Dict[str, Any]:
         """
@@ -340,57 +719,61 @@ class ProjectManager:
             报告文件路径
         """
         report_file = self.project_dir / f"{self.project_name}_report.md"
-        
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write(f"# {self.project_name} 项目报告\n\n")
-            f.write(f"生成时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            
-            # 项目概览
-            f.write("## 项目概览\n\n")
-            status = self.get_current_status()
-            f.write(f"- 项目名称：{status['project_name']}\n")
-            f.write(f"- 当前阶段：{status['current_phase']}\n")
-            f.write(f"- 阶段迭代：{status['phase_iteration']}\n")
-            f.write(f"- 项目状态：{status['status']}\n")
-            f.write(f"- 评审次数：{status['review_count']}\n\n")
-            
-            # 阶段评分历史
-            f.write("## 阶段评分历史\n\n")
-            for i, score in enumerate(self.state.phase_scores):
-                f.write(f"- 第{i+1}次评审：{score}分\n")
-            f.write("\n")
-            
-            # 阻塞问题
-            if self.state.blocked_issues:
-                f.write("## 阻塞问题\n\n")
-                for issue in self.state.blocked_issues:
-                    f.write(f"- **{issue.level.value}**：{issue.description}\n")
-                f.write("\n")
-            
-            # 改进建议
-            if self.state.improvements:
-                f.write("## 改进建议\n\n")
-                for improvement in self.state.improvements:
-                    f.write(f"- {improvement}\n")
-                f.write("\n")
-            
-            # 详细评审历史
-            f.write("## 详细评审历史\n\n")
-            for i, review in enumerate(self.state.review_history):
-                f.write(f"### 第{i+1}次评审 ({review.review_date})\n\n")
-                f.write(f"**总分：{review.score}分**\n\n")
-                
-                f.write("**检查项得分：**\n")
-                for item, score in review.checklist.items():
-                    f.write(f"- {item}：{score}分\n")
-                f.write("\n")
-                
-                if review.issues:
-                    f.write("**发现的问题：**\n")
-                    for issue in review.issues:
-                        f.write(f"- {issue.level.value}：{issue.description}\n")
-                    f.write("\n")
-        
+
+        # 先在内存拼好整份报告,最后一次性写盘,
+        # 避免几十次小粒度的文本写调用
+        parts = []
+        parts.append(f"# {self.project_name} 项目报告\n\n")
+        parts.append(f"生成时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+
+        # 项目概览
+        parts.append("## 项目概览\n\n")
+        status = self.get_current_status()
+        parts.append(f"- 项目名称：{status['project_name']}\n")
+        parts.append(f"- 当前阶段：{status['current_phase']}\n")
+        parts.append(f"- 阶段迭代：{status['phase_iteration']}\n")
+        parts.append(f"- 项目状态：{status['status']}\n")
+        parts.append(f"- 评审次数：{status['review_count']}\n\n")
+
+        # 阶段评分历史
+        parts.append("## 阶段评分历史\n\n")
+        for i, score in enumerate(self.state.phase_scores):
+            parts.append(f"- 第{i+1}次评审：{score}分\n")
+        parts.append("\n")
+
+        # 阻塞问题(存储在IssueStorage文件中)
+        blocked_issues = self.issue_storage.load_blocked_issues()
+        if blocked_issues:
+            parts.append("## 阻塞问题\n\n")
+            for issue in blocked_issues:
+                parts.append(f"- **{issue.level.value}**：{issue.description}\n")
+            parts.append("\n")
+
+        # 改进建议
+        if self.state.improvements:
+            parts.append("## 改进建议\n\n")
+            for improvement in self.state.improvements:
+                parts.append(f"- {improvement}\n")
+            parts.append("\n")
+
+        # 详细评审历史
+        parts.append("## 详细评审历史\n\n")
+        for i, review in enumerate(self.state.review_history):
+            parts.append(f"### 第{i+1}次评审 ({review.review_date})\n\n")
+            parts.append(f"**总分：{review.score}分**\n\n")
+
+            parts.append("**检查项得分：**\n")
+            for item, score in review.checklist.items():
+                parts.append(f"- {item}：{score}分\n")
+            parts.append("\n")
+
+            if review.issues:
+                parts.append("**发现的问题：**\n")
+                for issue in review.issues:
+                    parts.append(f"- {issue.level.value}：{issue.description}\n")
+                parts.append("\n")
+
+        report_file.write_text(''.join(parts), encoding='utf-8')
         return str(report_file)
     
     def _create_project_structure(self) -> None:
@@ -406,16 +789,32 @@ class ProjectManager:
         """加载或创建项目状态"""
         if self.state_file.exists():
             try:
-                with open(self.state_file, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    if content:  # 检查文件是否为空
-                        data = json.loads(content)
-                        return ProjectState.from_dict(data)
-                    else:
-                        # 文件为空，创建新状态
-                        pass
-            except (json.JSONDecodeError, FileNotFoundError):
-                # JSON解析错误或文件不存在，创建新状态
+                raw = self.state_file.read_bytes().strip()
+                if raw:  # 检查文件是否为空
+                    data = _load_state_bytes(raw)
+                    # 旧格式把历史内联在状态文件中;新格式历史在sidecar日志
+                    inline_count = len(data.get('review_history') or ())
+                    log_entries = self._load_history_log()
+                    if log_entries:
+                        data['review_history'] = (data.get('review_history') or []) + log_entries
+                    state = ProjectState.from_dict(data)
+                    if inline_count:
+                        # 一次性迁移: 内联历史补写进sidecar,并立即重写
+                        # 不含历史的状态文件 —— 否则只读操作(如反复查询
+                        # 状态)每次加载都会把同一批内联条目再追加一遍
+                        with open(self.history_log_file, 'ab') as f:
+                            f.write(b"".join(
+                                result.to_json_bytes() + b"\n"
+                                for result in state.review_history[:inline_count]
+                            ))
+                        _atomic_write_bytes(
+                            self.state_file,
+                            _dump_state_bytes(state.to_dict(include_history=False))
+                        )
+                    self._history_synced = len(state.review_history)
+                    return state
+            except (ValueError, FileNotFoundError):
+                # 解析错误或文件不存在，创建新状态
                 pass
         
         # 创建新状态 (blocked_issues已移除,存储在文件中)
@@ -430,20 +829,116 @@ class ProjectManager:
             review_history=[],
             created_at=datetime.now().isoformat()
         )
+        self._history_synced = 0
         # 直接保存状态，不调用self._save_state()
-        with open(self.state_file, 'w', encoding='utf-8') as f:
-            json.dump(state.to_dict(), f, ensure_ascii=False, indent=2)
+        _atomic_write_bytes(self.state_file, _dump_state_bytes(state.to_dict(include_history=False)))
         return state
-    
+
+    def _load_history_log(self) -> List[Dict[str, Any]]:
+        """
+        读取评审历史sidecar日志
+
+        Returns:
+            按追加顺序的评审历史字典列表
+        """
+        if not self.history_log_file.exists():
+            return []
+        entries = []
+        with open(self.history_log_file, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entries.append(_load_state_bytes(line))
+        return entries
+
     def _save_state(self) -> None:
-        """保存项目状态"""
-        with open(self.state_file, 'w', encoding='utf-8') as f:
-            json.dump(self.state.to_dict(), f, ensure_ascii=False, indent=2)
-    
-    def _execute_developer_phase(self) -> str:
+        """保存项目状态(事务内只标脏,事务结束统一落盘)"""
+        self._status_cache = None
+        self._dirty = True
+        if self._in_txn == 0:
+            self._flush_state()
+
+    def _write_output(self, path: Path, content: str) -> None:
+        """
+        写出阶段产物文件
+
+        事务内只入队,由最外层事务退出时统一连续写出;
+        事务外立即写盘。
+
+        Args:
+            path: 目标文件路径
+            content: 文件内容
+        """
+        data = content.encode('utf-8')
+        if self._in_txn:
+            self._pending_writes.append((path, data))
+        else:
+            path.write_bytes(data)
+
+    def _now(self) -> str:
+        """
+        取状态更新时间戳
+
+        事务内复用事务入口处取的同一时间,一个逻辑操作只调一次
+        datetime.now();事务外即时取值。
+
+        Returns:
+            ISO格式时间戳(秒精度)
+        """
+        if self._in_txn:
+            return self._txn_now
+        return datetime.now().isoformat(timespec='seconds')
+
+    def _flush_state(self) -> None:
+        """
+        落盘当前状态
+
+        新增的评审历史条目追加进sidecar日志(写入量O(新增)而非O(全部历史)),
+        其余可变标量原子写入状态文件(临时文件+os.replace)。
+        """
+        self._dirty = False
+        history = self.state.review_history
+        if len(history) > self._history_synced:
+            with open(self.history_log_file, 'ab') as f:
+                f.write(b"".join(
+                    result.to_json_bytes() + b"\n"
+                    for result in history[self._history_synced:]
+                ))
+            self._history_synced = len(history)
+        _atomic_write_bytes(self.state_file, _dump_state_bytes(self.state.to_dict(include_history=False)))
+
+    @contextmanager
+    def _txn(self):
+        """
+        状态写事务: 包裹一个逻辑操作,期间的多次状态变更合并为一次写盘
+
+        支持嵌套,只有最外层事务退出时才落盘。
+        """
+        if self._in_txn == 0:
+            # 整个逻辑操作共用入口处的一个时间戳
+            self._txn_now = datetime.now().isoformat(timespec='seconds')
+        self._in_txn += 1
+        try:
+            yield
+        finally:
+            self._in_txn -= 1
+            if self._in_txn == 0:
+                if self._pending_writes:
+                    # 输出文件集中连续写出,之后才落状态文件:
+                    # 状态宣称的产物一定已经在盘上
+                    for path, data in self._pending_writes:
+                        path.write_bytes(data)
+                    self._pending_writes.clear()
+                if self._dirty:
+                    self._flush_state()
+
+    def _execute_developer_phase(self, on_delta=None) -> str:
         """
         执行开发者模式任务 - 使用AI生成内容
 
+        Args:
+            on_delta: 可选的流式输出回调
+
         Returns:
             生成的内容
         """
@@ -458,17 +953,33 @@ class ProjectManager:
             )
 
         try:
-            # 获取项目上下文
-            context = self.ai_integration.get_current_context()
-
-            print(f"🤖 使用AI生成 {phase.value} 内容...")
-
-            # 使用AI生成内容
-            content = self.ai_integration.generate_content(
-                phase=phase,
-                context=context
+            # 迭代改进: 已有上一轮产出和评审问题时走重新生成路径,
+            # 请求结构可命中提示词缓存(流式回调场景仍走普通生成)
+            prev_content, review_issues = (
+                self._load_regeneration_inputs(phase, iteration)
+                if on_delta is None else (None, [])
             )
 
+            if prev_content is not None:
+                print(f"🤖 根据评审问题重新生成 {phase.value} 内容...")
+                content = self.ai_integration.regenerate_from_review(
+                    phase=phase,
+                    prev_content=prev_content,
+                    review_issues=review_issues
+                )
+            else:
+                # 获取项目上下文
+                context = self.ai_integration.get_current_context()
+
+                print(f"🤖 使用AI生成 {phase.value} 内容...")
+
+                # 使用AI生成内容
+                content = self.ai_integration.generate_content(
+                    phase=phase,
+                    context=context,
+                    on_delta=on_delta
+                )
+
             # 保存生成的内容到文件
             self._save_phase_output(content, phase, iteration)
 
@@ -482,6 +993,60 @@ class ProjectManager:
             print(f"🔄 回退到模板生成...")
             return self._generate_template_content(phase, iteration)
 
+    def _load_regeneration_inputs(
+        self,
+        phase: Phase,
+        iteration: int
+    ) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """
+        收集迭代改进所需的上一轮产出和评审问题
+
+        Args:
+            phase: 项目阶段
+            iteration: 当前迭代次数
+
+        Returns:
+            (上一轮内容, 评审问题列表)。首轮迭代、上一轮文件缺失
+            或没有评审问题时内容为None,表示应走普通生成路径
+        """
+        if iteration == 0:
+            return None, []
+
+        filename_fmt = self._PHASE_FILENAME_FMT.get(phase)
+        if filename_fmt is None:
+            return None, []
+
+        prev_file = (
+            self.phase_outputs_dir / phase.value.lower()
+            / filename_fmt.format(i=iteration)
+        )
+        if not prev_file.exists():
+            return None, []
+
+        latest_issues = self.issue_storage.get_latest_issues_for_phase(phase)
+        if not latest_issues:
+            return None, []
+
+        review_issues = [
+            {"level": issue.level.value, "description": issue.description}
+            for issue in latest_issues
+        ]
+        return prev_file.read_text(encoding='utf-8'), review_issues
+
+    # 阶段→模板生成方法的分发表(按方法名存储,实例上getattr绑定)
+    _TEMPLATE_GENERATORS = {
+        Phase.BASIC_DESIGN: "_generate_basic_design_document",
+        Phase.DETAIL_DESIGN: "_generate_detail_design_document",
+        Phase.DEVELOPMENT: "_generate_code_implementation",
+    }
+
+    # 阶段→输出文件名格式的分发表
+    _PHASE_FILENAME_FMT = {
+        Phase.BASIC_DESIGN: "basic_design_v{i}.md",
+        Phase.DETAIL_DESIGN: "detail_design_v{i}.md",
+        Phase.DEVELOPMENT: "implementation_v{i}.py",
+    }
+
     def _generate_template_content(self, phase: Phase, iteration: int) -> str:
         """
         使用模板生成内容(回退方案)
@@ -493,14 +1058,11 @@ class ProjectManager:
         Returns:
             生成的模板内容
         """
-        if phase == Phase.BASIC_DESIGN:
-            return self._generate_basic_design_document(iteration)
-        elif phase == Phase.DETAIL_DESIGN:
-            return self._generate_detail_design_document(iteration)
-        elif phase == Phase.DEVELOPMENT:
-            return self._generate_code_implementation(iteration)
-        else:
+        generator_name = self._TEMPLATE_GENERATORS.get(phase)
+        if generator_name is None:
             return f"# {phase.value} 模板内容\n\n待生成..."
+        with self._txn():
+            return getattr(self, generator_name)(iteration)
 
     def _save_phase_output(self, content: str, phase: Phase, iteration: int) -> None:
         """
@@ -515,80 +1077,22 @@ class ProjectManager:
         output_dir = self.phase_outputs_dir / phase.value.lower()
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # 根据阶段确定文件名和扩展名
-        if phase == Phase.BASIC_DESIGN:
-            filename = f"basic_design_v{iteration + 1}.md"
-        elif phase == Phase.DETAIL_DESIGN:
-            filename = f"detail_design_v{iteration + 1}.md"
-        elif phase == Phase.DEVELOPMENT:
-            filename = f"implementation_v{iteration + 1}.py"
-        else:
-            filename = f"output_v{iteration + 1}.md"
-
-        output_file = output_dir / filename
-
-        # 写入文件
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(content)
-
-        print(f"📁 输出已保存: {output_file}")
-
-    def _generate_basic_design_document(self, iteration: int) -> str:
-        """生成基本设计文档"""
-        content = f"""# {self.project_name} 基本设计文档 (第{iteration + 1}次迭代)
-
-## 1. 项目概述
-本项目是一个AI驱动的项目开发流程管理系统，支持双模式管理。
-
-## 2. 系统架构
-### 2.1 整体架构
-- 项目管理器 (ProjectManager)
-- 评审引擎 (ReviewEngine)
-- 状态管理 (ProjectState)
-
-### 2.2 核心模块
-- **项目管理器**：负责项目状态管理和流程控制
-- **评审引擎**：负责代码评审和评分
-- **数据模型**：定义项目状态和数据结构
-
-## 3. 接口设计
-### 3.1 ProjectManager接口
-- `set_mode(mode)`: 设置开发/评审模式
-- `execute_phase()`: 执行当前阶段任务
-- `review_phase()`: 评审当前阶段成果
-- `check_phase_transition()`: 检查阶段转换条件
-
-### 3.2 ReviewEngine接口
-- `evaluate(phase, content)`: 评估内容
-- `get_critical_issues()`: 获取关键问题
-- `get_next_improvement()`: 获取改进建议
-
-## 4. 数据结构
-### 4.1 项目状态
-```json
-{{
-    "project_name": "项目名称",
-    "current_phase": "当前阶段",
-    "phase_iteration": "迭代次数",
-    "status": "项目状态"
-}}
-```
-
-## 5. 异常处理
-- 文件读写异常处理
-- 状态转换异常处理
-- 评审过程异常处理
+        # 根据阶段确定文件名和扩展名 (查表分派,新增阶段只需扩表)
+        filename_fmt = self._PHASE_FILENAME_FMT.get(phase, "output_v{i}.md")
+        output_file = output_dir / filename_fmt.format(i=iteration + 1)
 
-## 6. 扩展性设计
-- 支持自定义评审规则
-- 支持多种输出格式
-- 支持插件化扩展
-"""
+        # 写入文件 (一次编码一次写出,绕过文本IO层的增量编码缓冲)
+        output_file.write_bytes(content.encode('utf-8'))
+
+        print(f"📁 输出已保存: {output_file}")
+
+    def _generate_basic_design_document(self, iteration: int) -> str:
+        """生成基本设计文档"""
+        content = _BASIC_DESIGN_TMPL.substitute(name=self.project_name, it=iteration + 1)
         
         # 保存设计文档
         design_file = self.phase_outputs_dir / "basic_design" / f"basic_design_v{iteration + 1}.md"
-        with open(design_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+        self._write_output(design_file, content)
         
         self.state.status = "READY_FOR_REVIEW"
         self._save_state()
@@ -597,115 +1101,11 @@ class ProjectManager:
     
     def _generate_code_implementation(self, iteration: int) -> str:
         """生成代码实现"""
-        content = f"""# {self.project_name} 代码实现 (第{iteration + 1}次迭代)
-
-import json
-import os
-from typing import Dict, List, Optional, Any
-from datetime import datetime
-from pathlib import Path
-
-class ProjectManager:
-    \"\"\"项目管理器主类\"\"\"
-    
-    def __init__(self, project_name: str):
-        self.project_name = project_name
-        self.project_dir = Path(f"project_manager/{{project_name}}")
-        self.state_file = self.project_dir / "project_state.json"
-        self.review_engine = ReviewEngine()
-        self.state = self._load_or_create_state()
-    
-    def set_mode(self, mode: str) -> None:
-        \"\"\"设置当前模式\"\"\"
-        if mode not in ["developer", "reviewer"]:
-            raise ValueError("模式必须是 'developer' 或 'reviewer'")
-        self.state.current_mode = Mode(mode)
-        self._save_state()
-    
-    def execute_phase(self) -> str:
-        \"\"\"执行当前阶段任务\"\"\"
-        if self.state.current_mode == Mode.DEVELOPER:
-            return self._execute_developer_phase()
-        else:
-            return "当前为评审模式，无法执行开发任务"
-    
-    def review_phase(self) -> Dict[str, Any]:
-        \"\"\"评审当前阶段成果\"\"\"
-        if self.state.current_mode != Mode.REVIEWER:
-            raise ValueError("当前不是评审模式")
-        
-        content = self._read_phase_output()
-        review_result = self.review_engine.evaluate(
-            self.state.current_phase, 
-            content
-        )
-        
-        # 更新项目状态
-        self.state.phase_scores.append(review_result['score'])
-        self._save_state()
-        
-        return review_result
-    
-    def _save_state(self) -> None:
-        \"\"\"保存项目状态\"\"\"
-        with open(self.state_file, 'w', encoding='utf-8') as f:
-            json.dump(self.state.to_dict(), f, ensure_ascii=False, indent=2)
-
-class ReviewEngine:
-    \"\"\"评审引擎类\"\"\"
-    
-    def __init__(self):
-        self.current_issues = []
-        self.current_improvements = []
-    
-    def evaluate(self, phase: Phase, content: str) -> Dict[str, Any]:
-        \"\"\"评估指定阶段的内容\"\"\"
-        checklist = self._get_checklist_for_phase(phase)
-        scores = self._evaluate_content(phase, content, checklist)
-        total_score = self.calculate_score(scores)
-        
-        return {{
-            'score': total_score,
-            'issues': [asdict(issue) for issue in self.current_issues],
-            'improvements': self.current_improvements,
-            'checklist': scores
-        }}
-    
-    def calculate_score(self, checklist: Dict[str, float]) -> float:
-        \"\"\"计算总分\"\"\"
-        total_score = 0.0
-        for item, score in checklist.items():
-            total_score += score
-        return round(total_score, 2)
-    
-    def get_next_improvement(self) -> str:
-        \"\"\"获取最重要的改进建议\"\"\"
-        if not self.current_improvements:
-            return "当前阶段工作质量良好，无需改进"
-        
-        critical_issues = self.get_critical_issues()
-        if critical_issues:
-            return f"Critical问题：{{critical_issues[0].description}}"
-        
-        return self.current_improvements[0]
-
-# 错误处理示例
-try:
-    manager = ProjectManager("test_project")
-    manager.set_mode("developer")
-    result = manager.execute_phase()
-    print(result)
-except Exception as e:
-    print(f"错误：{{e}}")
-    # 记录错误日志
-    with open("error.log", "a") as f:
-        f.write(f"{{datetime.now()}}: {{e}}\\n")
-"""
+        content = _CODE_IMPL_TMPL.substitute(name=self.project_name, it=iteration + 1)
         
         # 保存代码文件
         code_file = self.phase_outputs_dir / "development" / f"implementation_v{iteration + 1}.py"
-        with open(code_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+        self._write_output(code_file, content)
         
         self.state.status = "READY_FOR_REVIEW"
         self._save_state()
@@ -714,156 +1114,31 @@ except Exception as e:
     
     def _generate_detail_design_document(self, iteration: int) -> str:
         """生成详细设计文档"""
-        content = f"""# {self.project_name} 详细设计文档 (第{iteration + 1}次迭代)
-
-## 1. 代码架构
-### 1.1 类图设计
-```mermaid
-classDiagram
-    class ProjectManager {{{{
-        +project_name: str
-        +state: ProjectState
-        +review_engine: ReviewEngine
-        +set_mode(mode)
-        +execute_phase()
-        +review_phase()
-    }}}}
-    
-    class ReviewEngine {{{{
-        +current_issues: List[Issue]
-        +current_improvements: List[str]
-        +evaluate(phase, content)
-        +get_critical_issues()
-        +get_next_improvement()
-    }}}}
-    
-    class ProjectState {{{{
-        +project_name: str
-        +current_phase: Phase
-        +phase_iteration: int
-        +current_mode: Mode
-        +status: str
-        +to_dict()
-        +from_dict()
-    }}}}
-    
-    ProjectManager --> ProjectState
-    ProjectManager --> ReviewEngine
-```
-
-## 2. 核心算法
-### 2.1 评审算法伪代码
-```
-function evaluate(phase, content):
-    checklist = get_checklist_for_phase(phase)
-    scores = {{}}
-    
-    for item in checklist:
-        score = evaluate_item(content, item)
-        scores[item] = score
-        
-        if score < threshold:
-            add_issue(level, description)
-    
-    total_score = calculate_total_score(scores)
-    return {{score: total_score, issues: issues, improvements: improvements}}
-```
-
-## 3. 数据结构定义
-### 3.1 核心数据结构
-```python
-@dataclass
-class Issue:
-    level: IssueLevel
-    description: str
-    line_number: Optional[int]
-    file_path: Optional[str]
-    created_at: str
-
-@dataclass
-class ReviewResult:
-    score: float
-    issues: List[Issue]
-    improvements: List[str]
-    checklist: Dict[str, float]
-    review_date: str
-
-@dataclass
-class ProjectState:
-    project_name: str
-    current_phase: Phase
-    phase_iteration: int
-    current_mode: Mode
-    status: str
-    phase_scores: List[float]
-    blocked_issues: List[Issue]
-    improvements: List[str]
-    review_history: List[ReviewResult]
-    created_at: str
-    updated_at: str
-    from_rollback: bool
-    rollback_count: int
-    phase_history: Dict[str, PhaseHistory]
-```
-
-## 4. 关键流程时序图
-### 4.1 评审流程
-```mermaid
-sequenceDiagram
-    participant U as User
-    participant PM as ProjectManager
-    participant RE as ReviewEngine
-    participant FS as FileSystem
-    
-    U->>PM: set_mode("reviewer")
-    PM->>FS: read_phase_output()
-    FS-->>PM: content
-    PM->>RE: evaluate(phase, content)
-    RE-->>PM: review_result
-    PM->>FS: save_state()
-    PM-->>U: review_result
-```
-
-## 5. 异常处理策略
-### 5.1 异常分类
-- **文件异常**: 文件不存在、权限不足、格式错误
-- **状态异常**: 状态转换失败、数据不一致
-- **评审异常**: 内容解析失败、评分计算错误
-
-### 5.2 处理策略
-```python
-try:
-    # 执行操作
-    result = operation()
-except FileNotFoundError:
-    # 创建默认文件
-    create_default_file()
-except PermissionError:
-    # 提示用户权限问题
-    show_permission_error()
-except Exception as e:
-    # 记录错误日志
-    log_error(e)
-    # 返回错误信息
-    return error_response(e)
-```
-"""
+        content = _DETAIL_DESIGN_TMPL.substitute(name=self.project_name, it=iteration + 1)
         
         # 保存设计文档
         design_file = self.phase_outputs_dir / "detail_design" / f"detail_design_v{iteration + 1}.md"
-        with open(design_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+        self._write_output(design_file, content)
         
         self.state.status = "READY_FOR_REVIEW"
         self._save_state()
         
         return f"详细设计文档已生成：{design_file}"
     
-    def _read_phase_output(self) -> str:
-        """读取当前阶段的输出文件"""
+    def _locate_phase_output(self) -> Optional[Path]:
+        """
+        定位当前阶段的输出文件
+
+        _save_phase_output和模板生成器写在阶段子目录
+        (phase_outputs/{phase}/...)下,优先在那里查找;
+        兼容旧版直接写在phase_outputs根目录的文件。
+
+        Returns:
+            存在的输出文件路径,找不到时返回None
+        """
         phase_name = self.state.current_phase.value
         iteration = self.state.phase_iteration
-        
+
         # 首先尝试查找带版本号的文件
         if self.state.current_phase == Phase.BASIC_DESIGN:
             file_patterns = [f"basic_design_v{iteration + 1}.md", f"{phase_name}.md"]
@@ -873,61 +1148,62 @@ except Exception as e:
             file_patterns = [f"implementation_v{iteration + 1}.py", f"{phase_name}.py", f"{phase_name}.md"]
         else:
             file_patterns = [f"output_v{iteration + 1}.md", f"{phase_name}.md"]
-        
-        # 尝试查找文件
+
+        phase_dir = self.phase_outputs_dir / phase_name.lower()
         for file_pattern in file_patterns:
-            output_file = self.phase_outputs_dir / file_pattern
-            if output_file.exists():
-                try:
-                    with open(output_file, 'r', encoding='utf-8') as f:
-                        return f.read()
-                except Exception as e:
-                    print(f"读取文件失败: {e}")
-                    continue
+            for output_file in (phase_dir / file_pattern,
+                                self.phase_outputs_dir / file_pattern):
+                if output_file.exists():
+                    return output_file
+        return None
+
+    def _read_phase_output(self) -> str:
+        """读取当前阶段的输出文件"""
+        output_file = self._locate_phase_output()
+        if output_file is not None:
+            try:
+                return output_file.read_text(encoding='utf-8')
+            except Exception as e:
+                print(f"读取文件失败: {e}")
         
         # 如果找不到文件，返回默认内容
         return f"# {self.state.current_phase.value} 阶段输出\n\n当前阶段暂无输出内容。"
     
     def _update_review_history(self, review_result: Dict[str, Any]) -> None:
-        """更新评审历史文件"""
-        with open(self.review_history_file, 'a', encoding='utf-8') as f:
-            f.write(f"## 第{len(self.state.review_history)}次评审 ({review_result['review_date']})\n\n")
-            f.write(f"**阶段：** {self.state.current_phase.value}\n")
-            f.write(f"**迭代：** {self.state.phase_iteration + 1}\n")
-            f.write(f"**总分：** {review_result['score']}/25分\n\n")
-            
-            f.write("**专项评分：**\n")
-            for item, score in review_result['checklist'].items():
-                f.write(f"- {item}：{score}/25分\n")
-            f.write("\n")
-            
-            if review_result['issues']:
-                f.write("**问题分级：**\n")
-                critical_issues = [issue for issue in review_result['issues'] if issue['level'] == 'CRITICAL']
-                major_issues = [issue for issue in review_result['issues'] if issue['level'] == 'MAJOR']
-                minor_issues = [issue for issue in review_result['issues'] if issue['level'] == 'MINOR']
-                
-                if critical_issues:
-                    f.write("**CRITICAL（需回退）：**\n")
-                    for issue in critical_issues:
-                        f.write(f"- {issue['description']}\n")
-                    f.write("\n")
-                
-                if major_issues:
-                    f.write("**MAJOR（必须修复）：**\n")
-                    for issue in major_issues:
-                        f.write(f"- {issue['description']}\n")
-                    f.write("\n")
-                
-                if minor_issues:
-                    f.write("**MINOR（建议改进）：**\n")
-                    for issue in minor_issues:
-                        f.write(f"- {issue['description']}\n")
-                    f.write("\n")
-            
-            if review_result['improvements']:
-                f.write("**本次修改点（仅一个）：**\n")
-                f.write(f"- {review_result['improvements'][0]}\n")
-                f.write("\n")
-            
-            f.write("---\n\n")
+        """更新评审历史文件(内存拼好增量,一次追加写出)"""
+        parts = [
+            f"## 第{len(self.state.review_history)}次评审 ({review_result['review_date']})\n\n",
+            f"**阶段：** {self.state.current_phase.value}\n",
+            f"**迭代：** {self.state.phase_iteration + 1}\n",
+            f"**总分：** {review_result['score']}/25分\n\n",
+            "**专项评分：**\n",
+        ]
+        for item, score in review_result['checklist'].items():
+            parts.append(f"- {item}：{score}/25分\n")
+        parts.append("\n")
+
+        if review_result['issues']:
+            parts.append("**问题分级：**\n")
+            # 单趟按级别分桶,替代三次列表推导各扫一遍
+            by_level = {'CRITICAL': [], 'MAJOR': [], 'MINOR': []}
+            for issue in review_result['issues']:
+                by_level.setdefault(issue['level'], []).append(issue)
+
+            for level, heading in (('CRITICAL', "**CRITICAL（需回退）：**\n"),
+                                   ('MAJOR', "**MAJOR（必须修复）：**\n"),
+                                   ('MINOR', "**MINOR（建议改进）：**\n")):
+                if by_level[level]:
+                    parts.append(heading)
+                    for issue in by_level[level]:
+                        parts.append(f"- {issue['description']}\n")
+                    parts.append("\n")
+
+        if review_result['improvements']:
+            parts.append("**本次修改点（仅一个）：**\n")
+            parts.append(f"- {review_result['improvements'][0]}\n")
+            parts.append("\n")
+
+        parts.append("---\n\n")
+
+        with open(self.review_history_file, 'ab') as f:
+            f.write(''.join(parts).encode('utf-8'))
@@ -5,9 +5,17 @@
 
 import os
 import json
+import re
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+from .parse_cache import cached_parse
+
+# 评审标准权重行: - **业务完整性 (30%)**：需求覆盖是否完整
+_STANDARD_WEIGHT_RE = re.compile(r'^- \*\*(.+?)\s*\((\d+(?:\.\d+)?)%\)\*\*')
+# 阶段配置行: - **通过分数**：80分
+_CONFIG_ITEM_RE = re.compile(r'^- \*\*(.+?)\*\*：(.*)$')
+
 
 class PromptManager:
     """提示词管理器，负责加载和管理各种提示词模板"""
@@ -86,69 +94,41 @@ class PromptManager:
         return self._workflows.get(workflow_type, {})
     
     def _load_standards(self):
-        """加载评审标准"""
-        standards_file = self.prompts_dir / "standards" / "review_standards.md"
-        if standards_file.exists():
-            content = standards_file.read_text(encoding='utf-8')
-            self._standards = self._parse_standards(content)
-        else:
-            self._standards = {}
-    
+        """加载评审标准(解析结果按内容哈希缓存到磁盘)"""
+        path = self.prompts_dir / "standards" / "review_standards.md"
+        self._standards = cached_parse(path, self._parse_standards) if path.exists() else {}
+
     def _load_templates(self):
-        """加载生成模板"""
-        templates_file = self.prompts_dir / "templates" / "generation_templates.md"
-        if templates_file.exists():
-            content = templates_file.read_text(encoding='utf-8')
-            self._templates = self._parse_templates(content)
-        else:
-            self._templates = {}
-    
+        """加载生成模板(解析结果按内容哈希缓存到磁盘)"""
+        path = self.prompts_dir / "templates" / "generation_templates.md"
+        self._templates = cached_parse(path, self._parse_templates) if path.exists() else {}
+
     def _load_configs(self):
-        """加载阶段配置"""
-        configs_file = self.prompts_dir / "configs" / "phase_configs.md"
-        if configs_file.exists():
-            content = configs_file.read_text(encoding='utf-8')
-            self._configs = self._parse_configs(content)
-        else:
-            self._configs = {}
-    
+        """加载阶段配置(解析结果按内容哈希缓存到磁盘)"""
+        path = self.prompts_dir / "configs" / "phase_configs.md"
+        self._configs = cached_parse(path, self._parse_configs) if path.exists() else {}
+
     def _load_workflows(self):
-        """加载工作流规则"""
-        workflows_file = self.prompts_dir / "workflows" / "workflow_rules.md"
-        if workflows_file.exists():
-            content = workflows_file.read_text(encoding='utf-8')
-            self._workflows = self._parse_workflows(content)
-        else:
-            self._workflows = {}
+        """加载工作流规则(解析结果按内容哈希缓存到磁盘)"""
+        path = self.prompts_dir / "workflows" / "workflow_rules.md"
+        self._workflows = cached_parse(path, self._parse_workflows) if path.exists() else {}
     
     def _parse_standards(self, content: str) -> Dict[str, Any]:
         """解析评审标准内容"""
         standards = {}
         current_phase = None
         
-        lines = content.split('\n')
+        lines = content.splitlines()
         for line in lines:
             line = line.strip()
             if line.startswith('### ') and '阶段评审标准' in line:
                 current_phase = line.replace('### ', '').replace(' 阶段评审标准', '')
                 standards[current_phase] = {}
-            elif line.startswith('- **') and current_phase and '%' in line:
+            elif current_phase:
                 # 解析权重配置，格式：- **业务完整性 (30%)**：需求覆盖是否完整
-                try:
-                    # 提取项目名称和权重
-                    start = line.find('**') + 2
-                    end = line.find('**', start)
-                    if start > 1 and end > start:
-                        item_part = line[start:end]
-                        # 提取项目名称（去掉权重部分）
-                        item = item_part.split(' (')[0]
-                        # 提取权重
-                        weight_part = item_part.split('(')[1].split(')')[0]
-                        weight = float(weight_part.replace('%', ''))
-                        standards[current_phase][item] = weight
-                except (ValueError, IndexError):
-                    # 如果解析失败，跳过这一行
-                    continue
+                match = _STANDARD_WEIGHT_RE.match(line)
+                if match:
+                    standards[current_phase][match.group(1)] = float(match.group(2))
         
         return standards
     
@@ -158,7 +138,7 @@ class PromptManager:
         current_phase = None
         current_template = []
         
-        lines = content.split('\n')
+        lines = content.splitlines()
         for line in lines:
             if line.startswith('## ') and '阶段生成模板' in line:
                 if current_phase and current_template:
@@ -179,26 +159,17 @@ class PromptManager:
         configs = {}
         current_phase = None
         
-        lines = content.split('\n')
+        lines = content.splitlines()
         for line in lines:
             line = line.strip()
             if line.startswith('### ') and '（' in line and '）' in line:
                 current_phase = line.split('（')[0].replace('### ', '')
                 configs[current_phase] = {}
-            elif line.startswith('- **') and current_phase and '：' in line:
+            elif current_phase:
                 # 解析配置项，格式：- **通过分数**：80分
-                try:
-                    # 提取键名
-                    start = line.find('**') + 2
-                    end = line.find('**', start)
-                    if start > 1 and end > start:
-                        key = line[start:end]
-                        # 提取值
-                        value = line.split('：', 1)[1]
-                        configs[current_phase][key] = value
-                except (ValueError, IndexError):
-                    # 如果解析失败，跳过这一行
-                    continue
+                match = _CONFIG_ITEM_RE.match(line)
+                if match:
+                    configs[current_phase][match.group(1)] = match.group(2)
         
         return configs
     
@@ -208,7 +179,7 @@ class PromptManager:
         current_workflow = None
         current_rules = []
         
-        lines = content.split('\n')
+        lines = content.splitlines()
         for line in lines:
             if line.startswith('### ') and '模式' in line:
                 if current_workflow and current_rules:
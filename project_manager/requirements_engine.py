@@ -81,36 +81,31 @@ class RequirementsEngine:
         # 生成技术栈配置文件
         tech_stack_config = self._generate_tech_stack_config(requirements['tech_stack'])
         tech_stack_file = config_dir / "tech_stack.json"
-        with open(tech_stack_file, 'w', encoding='utf-8') as f:
-            json.dump(tech_stack_config, f, ensure_ascii=False, indent=2)
+        tech_stack_file.write_text(json.dumps(tech_stack_config, ensure_ascii=False, indent=2), encoding='utf-8')
         config_files['tech_stack'] = str(tech_stack_file)
         
         # 生成数据库配置文件
         db_config = self._generate_database_config(requirements['database'])
         db_file = config_dir / "database.json"
-        with open(db_file, 'w', encoding='utf-8') as f:
-            json.dump(db_config, f, ensure_ascii=False, indent=2)
+        db_file.write_text(json.dumps(db_config, ensure_ascii=False, indent=2), encoding='utf-8')
         config_files['database'] = str(db_file)
         
         # 生成部署配置文件
         deploy_config = self._generate_deployment_config(requirements['deployment'])
         deploy_file = config_dir / "deployment.json"
-        with open(deploy_file, 'w', encoding='utf-8') as f:
-            json.dump(deploy_config, f, ensure_ascii=False, indent=2)
+        deploy_file.write_text(json.dumps(deploy_config, ensure_ascii=False, indent=2), encoding='utf-8')
         config_files['deployment'] = str(deploy_file)
         
         # 生成开发环境配置文件
         dev_config = self._generate_dev_config(requirements['tech_stack'], requirements['project_type'])
         dev_file = config_dir / "development.json"
-        with open(dev_file, 'w', encoding='utf-8') as f:
-            json.dump(dev_config, f, ensure_ascii=False, indent=2)
+        dev_file.write_text(json.dumps(dev_config, ensure_ascii=False, indent=2), encoding='utf-8')
         config_files['development'] = str(dev_file)
         
         # 生成项目要件文档
         requirements_doc = self._generate_requirements_doc(requirements)
         doc_file = config_dir / "requirements.md"
-        with open(doc_file, 'w', encoding='utf-8') as f:
-            f.write(requirements_doc)
+        doc_file.write_text(requirements_doc, encoding='utf-8')
         config_files['requirements_doc'] = str(doc_file)
         
         return config_files
@@ -0,0 +1,86 @@
+"""
+响应缓存模块
+基于SQLite的内容寻址缓存,按(阶段, 内容哈希)持久化评审结果,
+避免对完全相同的内容重复调用Claude API
+"""
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+class SQLiteCache:
+    """SQLite响应缓存类"""
+
+    def __init__(self, path: str = ".project_cache.db"):
+        """
+        初始化缓存
+
+        Args:
+            path: SQLite数据库文件路径
+        """
+        self.path = Path(path)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        # WAL模式: 读写不互相阻塞,适合并行评审场景
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "  key TEXT PRIMARY KEY,"
+            "  value TEXT NOT NULL,"
+            "  created_at TEXT DEFAULT CURRENT_TIMESTAMP"
+            ")"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(phase: str, content: str) -> str:
+        """
+        计算内容寻址的缓存键
+
+        Args:
+            phase: 阶段标识
+            content: 待评审/生成的内容
+
+        Returns:
+            sha256十六进制摘要
+        """
+        return hashlib.sha256(f"{phase}|{content}".encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        查询缓存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存的结果字典,未命中返回None
+        """
+        row = self._conn.execute(
+            "SELECT value FROM response_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0])
+        except (ValueError, TypeError):
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键
+            value: 可JSON序列化的结果字典
+        """
+        self._conn.execute(
+            "INSERT OR REPLACE INTO response_cache (key, value) VALUES (?, ?)",
+            (key, json.dumps(value, ensure_ascii=False))
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        self._conn.close()